@@ -31,7 +31,10 @@ from bot.handlers.categorization import handle_auto_categorize, handle_categoriz
 
 
 def register_handlers(app):
-    """Register all handlers for the bot."""
+    """Register all handlers for the bot. Calling it again on the same application is a no-op."""
+    if app.bot_data.get("handlers_registered"):
+        return
+    app.bot_data["handlers_registered"] = True
 
     # === Conversation Handlers ===
 
@@ -11,6 +11,8 @@ from core.services.spending_pattern import FinancialAnalysisService
 # Conversation states
 SETTING_CATEGORY, SETTING_AMOUNT = range(2)
 
+BUDGET_ALERT_TYPES = frozenset({'budget_exceeded', 'budget_warning'})
+
 
 @requires_registration()
 async def handle_budget_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -324,7 +326,7 @@ async def _show_budget_alerts(query, user_id):
         alerts = alert_repo.get_user_alerts(account.id, unread_only=False)
 
         # Filter budget-related alerts
-        budget_alerts = [a for a in alerts if a.alert_type in ['budget_exceeded', 'budget_warning']]
+        budget_alerts = [a for a in alerts if a.alert_type in BUDGET_ALERT_TYPES]
 
         if not budget_alerts:
             await query.edit_message_text(
@@ -2,6 +2,7 @@ import os
 import re
 
 import numpy as np
+from core.chart.advanced_visuals import CHART_DPI, PNG_OPTIONS
 from matplotlib import pyplot as plt
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler, MessageHandler, filters
@@ -459,7 +460,7 @@ async def _show_goal_progress(query, user_id):
             ax2.set_title('Goals Status Distribution')
 
         plt.tight_layout()
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+        plt.savefig(chart_path, dpi=CHART_DPI, bbox_inches='tight', pil_kwargs=PNG_OPTIONS)
         plt.close()
 
         # Send chart
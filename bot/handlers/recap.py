@@ -1,3 +1,4 @@
+import asyncio
 import os
 from datetime import datetime, date
 
@@ -13,10 +14,10 @@ from bot.utils.date_parser import (
     get_user_transaction_date_bounds,
     get_date_range_suggestions,
     calculate_preset_dates,
-    get_preset_transaction_count
+    get_preset_counts_and_bounds
 )
-from core.chart.report_generator import generate_all_charts, combine_charts
-from core.database import Session
+from core.chart.report_generator import generate_report
+from core.database import session_scope
 from core.repository.BankAccountRepository import BankAccountRepository
 from core.repository.TransactionRepository import TransactionRepository
 
@@ -39,12 +40,13 @@ async def handle_recap_all_time(update: Update, context: ContextTypes.DEFAULT_TY
     if os.path.exists(chart_path):
         await send_photo()
     else:
-        bank_account_repo = BankAccountRepository(Session())
-        bank_account = bank_account_repo.get_by_telegram_id(str(user_id))
-        bank_trx_repo = TransactionRepository(Session())
-        transactions = bank_trx_repo.get_all_transactions(bank_account.id)
-        generate_all_charts(transactions, user_id, is_all_trx=True)
-        combine_charts(user_id, period="All time", is_all_trx=True)
+        with session_scope() as db:
+            bank_account = BankAccountRepository(db).get_by_telegram_id(str(user_id))
+            # Closing the stream and the session releases the cursor and connection on every path
+            with TransactionRepository(db).stream_rows_for_report(bank_account.id) as transactions:
+                # Keep the event loop serving other users while the report is drawn
+                await asyncio.get_running_loop().run_in_executor(
+                    None, generate_report, transactions, user_id, "", True)
         await send_photo()
 
 
@@ -52,14 +54,16 @@ async def handle_recap_all_time(update: Update, context: ContextTypes.DEFAULT_TY
 async def handle_sync_recap(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Synchronizes the user's financial data and generates a recap."""
     user_id = update.effective_user.id
-    bank_account_repo = BankAccountRepository(Session())
-    bank_trx_repo = TransactionRepository(Session())
-    bank_account = bank_account_repo.get_by_telegram_id(str(user_id))
-    transactions = bank_trx_repo.get_all_transactions(bank_account.id)
-
-    if transactions:
-        generate_all_charts(transactions, user_id, is_all_trx=True)
-        combine_charts(user_id, period="All time", is_all_trx=True)
+    with session_scope() as db:
+        bank_account = BankAccountRepository(db).get_by_telegram_id(str(user_id))
+        bank_trx_repo = TransactionRepository(db)
+        has_transactions = bool(bank_trx_repo.count_transactions(bank_account.id))
+        if has_transactions:
+            with bank_trx_repo.stream_rows_for_report(bank_account.id) as transactions:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, generate_report, transactions, user_id, "", True)
+
+    if has_transactions:
         await update.message.reply_text(
             "Recap synchronized and updated, use /recap_all_time to view the updated chart.")
     else:
@@ -97,10 +101,9 @@ def generate_recap_text(statistics):
 async def handle_recap_all_time_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Sends a recap of the user's financial data for all time in text format."""
     user_id = update.effective_user.id
-    bank_account_repo = BankAccountRepository(Session())
-    bank_account = bank_account_repo.get_by_telegram_id(str(user_id))
-    bank_trx_repo = TransactionRepository(Session())
-    statistics = bank_trx_repo.get_transaction_statistics(bank_account.id)
+    with session_scope() as db:
+        bank_account = BankAccountRepository(db).get_by_telegram_id(str(user_id))
+        statistics = TransactionRepository(db).get_transaction_statistics(bank_account.id)
 
     if statistics:
         recap_message = generate_recap_text(statistics)
@@ -130,14 +133,16 @@ async def handle_recap_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def handle_custom_time_start_with_presets(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show preset buttons for quick date range selection."""
     user_id = update.effective_user.id
-    min_date, max_date = get_user_transaction_date_bounds(user_id)
+    min_date, max_date, counts = get_preset_counts_and_bounds(user_id, [
+        "preset_7d", "preset_30d", "preset_this_month", "preset_last_month", "preset_this_year", "preset_last_year"
+    ], context)
 
     # Create preset buttons with transaction counts
     preset_buttons = []
 
     # Row 1: Last 7 days, Last 30 days
-    count_7d = get_preset_transaction_count("preset_7d", user_id)
-    count_30d = get_preset_transaction_count("preset_30d", user_id)
+    count_7d = counts["preset_7d"]
+    count_30d = counts["preset_30d"]
 
     btn_7d_text = "📅 Last 7 Days"
     btn_30d_text = "📅 Last 30 Days"
@@ -153,8 +158,8 @@ async def handle_custom_time_start_with_presets(update: Update, context: Context
     ])
 
     # Row 2: This month, Last month
-    count_this_month = get_preset_transaction_count("preset_this_month", user_id)
-    count_last_month = get_preset_transaction_count("preset_last_month", user_id)
+    count_this_month = counts["preset_this_month"]
+    count_last_month = counts["preset_last_month"]
 
     btn_this_month_text = "📅 This Month"
     btn_last_month_text = "📅 Last Month"
@@ -170,8 +175,8 @@ async def handle_custom_time_start_with_presets(update: Update, context: Context
     ])
 
     # Row 3: This year, Last year
-    count_this_year = get_preset_transaction_count("preset_this_year", user_id)
-    count_last_year = get_preset_transaction_count("preset_last_year", user_id)
+    count_this_year = counts["preset_this_year"]
+    count_last_year = counts["preset_last_year"]
 
     btn_this_year_text = "📅 This Year"
     btn_last_year_text = "📅 Last Year"
@@ -235,7 +240,7 @@ async def handle_preset_callback(update: Update, context: ContextTypes.DEFAULT_T
         start_date, end_date, description = calculate_preset_dates(data)
 
         # Validate against user's data
-        min_date, max_date = get_user_transaction_date_bounds(user_id)
+        min_date, max_date = get_user_transaction_date_bounds(user_id, context)
         is_valid, validation_msg = validate_date_range(start_date, end_date, min_date, max_date)
 
         if not is_valid:
@@ -289,7 +294,7 @@ async def handle_custom_time_start(update: Update, context: ContextTypes.DEFAULT
     user_id = update.effective_user.id
 
     # Get user's transaction date bounds
-    min_date, max_date = get_user_transaction_date_bounds(user_id)
+    min_date, max_date = get_user_transaction_date_bounds(user_id, context)
 
     # Prepare message with context
     message_parts = ["📅 <b>Custom Time Range Recap</b>\n"]
@@ -332,7 +337,7 @@ async def handle_custom_time_input_start(update: Update, context: ContextTypes.D
         start_date = parse_flexible_date(user_input)
 
         # Get user's transaction bounds for validation
-        min_date, max_date = get_user_transaction_date_bounds(user_id)
+        min_date, max_date = get_user_transaction_date_bounds(user_id, context)
 
         # Store the parsed start date
         context.user_data["start_date"] = start_date
@@ -370,7 +375,7 @@ async def handle_custom_time_input_start(update: Update, context: ContextTypes.D
             error_parts.append(f"• <code>{suggestion}</code>")
 
         # Add user-specific context if available
-        min_date, max_date = get_user_transaction_date_bounds(user_id)
+        min_date, max_date = get_user_transaction_date_bounds(user_id, context)
         if min_date and max_date:
             error_parts.extend([
                 "",
@@ -384,8 +389,8 @@ async def handle_custom_time_input_start(update: Update, context: ContextTypes.D
 
 def generate_recap(start_date, end_date):
     """Generate recap statistics for the given date range."""
-    bank_trx_repo = TransactionRepository(Session())
-    return bank_trx_repo.get_transaction_statistics_by_date_range(start_date, end_date)
+    with session_scope() as db:
+        return TransactionRepository(db).get_transaction_statistics_by_date_range(start_date, end_date)
 
 
 @requires_registration()
@@ -80,15 +80,18 @@ async def _show_account_info(query, user_id):
     from core.repository.TransactionRepository import TransactionRepository
 
     session = Session()
-    account_repo = BankAccountRepository(session)
-    account = account_repo.get_by_telegram_id(str(user_id))
+    try:
+        account_repo = BankAccountRepository(session)
+        account = account_repo.get_by_telegram_id(str(user_id))
 
-    if not account:
-        await query.edit_message_text("❌ No account found.")
-        return
+        if not account:
+            await query.edit_message_text("❌ No account found.")
+            return
 
-    trx_repo = TransactionRepository(session)
-    transactions = trx_repo.get_all_transactions(account.id)
+        trx_repo = TransactionRepository(session)
+        transaction_count = trx_repo.count_transactions(account.id)
+    finally:
+        session.close()
 
     account_text = (
         "👤 <b>Account Information</b>\n\n"
@@ -97,7 +100,7 @@ async def _show_account_info(query, user_id):
         f"💳 <b>Account Number:</b> {account.account_number or 'Not set'}\n"
         f"💰 <b>Current Balance:</b> {account.balance:,.0f} IDR\n" if account.balance else "💰 <b>Current Balance:</b> Not available\n"
                                                                                           f"📅 <b>Birth Date:</b> {account.birth_date.strftime('%Y-%m-%d') if account.birth_date else 'Not set'}\n"
-                                                                                          f"📊 <b>Total Transactions:</b> {len(transactions)}\n\n"
+                                                                                          f"📊 <b>Total Transactions:</b> {transaction_count}\n\n"
                                                                                           "💡 <b>Account Status:</b> Active ✅\n"
                                                                                           "🔒 <b>Data Security:</b> All data is encrypted and secure"
     )
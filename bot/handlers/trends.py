@@ -1,7 +1,11 @@
+import asyncio
+from functools import partial
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 from bot.utils.auth import requires_registration
 from core.services.spending_pattern import FinancialAnalysisService
+from core.cache.df_cache import get_or_build_df
 from core.chart.advanced_visuals import (
     plot_spending_trends,
     plot_category_trends,
@@ -12,6 +16,11 @@ from core.chart.advanced_visuals import (
 import os
 
 
+async def _run_blocking(func, *args):
+    """Run a database query or chart render in the default executor, off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(None, partial(func, *args))
+
+
 @requires_registration()
 async def handle_trends_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show trends analysis menu."""
@@ -76,22 +85,13 @@ async def handle_trends_callback(update: Update, context: ContextTypes.DEFAULT_T
 
 async def _generate_spending_trends(query, user_id):
     """Generate spending trends analysis."""
-    from core.database import Session
-    from core.repository.BankAccountRepository import BankAccountRepository
-    from core.repository.TransactionRepository import TransactionRepository
-
-    session = Session()
-    account_repo = BankAccountRepository(session)
-    account = account_repo.get_by_telegram_id(str(user_id))
+    df = await _run_blocking(get_or_build_df, user_id)
 
-    if not account:
+    if df is None:
         await query.edit_message_text("❌ No account found.")
         return
 
-    trx_repo = TransactionRepository(session)
-    transactions = trx_repo.get_all_transactions(account.id)
-
-    if not transactions:
+    if df.empty:
         await query.edit_message_text("❌ No transactions found for analysis.")
         return
 
@@ -100,11 +100,11 @@ async def _generate_spending_trends(query, user_id):
 
     # Monthly trends
     monthly_path = f"cache/chart_cache/{user_id}_monthly_trends.png"
-    plot_spending_trends(transactions, monthly_path, 'monthly')
+    await _run_blocking(plot_spending_trends, df, monthly_path, 'monthly')
 
     # Daily trends
     daily_path = f"cache/chart_cache/{user_id}_daily_trends.png"
-    plot_spending_trends(transactions, daily_path, 'daily')
+    await _run_blocking(plot_spending_trends, df, daily_path, 'daily')
 
     # Send charts
     with open(monthly_path, 'rb') as chart:
@@ -126,33 +126,24 @@ async def _generate_spending_trends(query, user_id):
 
 async def _generate_category_trends(query, user_id):
     """Generate category trends analysis."""
-    from core.database import Session
-    from core.repository.BankAccountRepository import BankAccountRepository
-    from core.repository.TransactionRepository import TransactionRepository
-
-    session = Session()
-    account_repo = BankAccountRepository(session)
-    account = account_repo.get_by_telegram_id(str(user_id))
+    df = await _run_blocking(get_or_build_df, user_id)
 
-    if not account:
+    if df is None:
         await query.edit_message_text("❌ No account found.")
         return
 
-    trx_repo = TransactionRepository(session)
-    transactions = trx_repo.get_all_transactions(account.id)
-
-    if not transactions:
+    if df.empty:
         await query.edit_message_text("❌ No transactions found for analysis.")
         return
 
     # Generate category trends chart
     os.makedirs("cache/chart_cache", exist_ok=True)
     chart_path = f"cache/chart_cache/{user_id}_category_trends.png"
-    plot_category_trends(transactions, chart_path)
+    await _run_blocking(plot_category_trends, df, chart_path)
 
     # Get text insights
     analysis_service = FinancialAnalysisService()
-    insights = analysis_service.get_category_insights(user_id)
+    insights = await _run_blocking(analysis_service.get_category_insights, user_id)
 
     insight_text = "📊 <b>Category Insights (Last 30 days vs Previous 30 days)</b>\n\n"
 
@@ -175,29 +166,20 @@ async def _generate_category_trends(query, user_id):
 
 async def _generate_weekday_analysis(query, user_id):
     """Generate day-of-week spending analysis."""
-    from core.database import Session
-    from core.repository.BankAccountRepository import BankAccountRepository
-    from core.repository.TransactionRepository import TransactionRepository
+    df = await _run_blocking(get_or_build_df, user_id)
 
-    session = Session()
-    account_repo = BankAccountRepository(session)
-    account = account_repo.get_by_telegram_id(str(user_id))
-
-    if not account:
+    if df is None:
         await query.edit_message_text("❌ No account found.")
         return
 
-    trx_repo = TransactionRepository(session)
-    transactions = trx_repo.get_all_transactions(account.id)
-
-    if not transactions:
+    if df.empty:
         await query.edit_message_text("❌ No transactions found for analysis.")
         return
 
     # Generate weekday analysis chart
     os.makedirs("cache/chart_cache", exist_ok=True)
     chart_path = f"cache/chart_cache/{user_id}_weekday_analysis.png"
-    plot_day_of_week_analysis(transactions, chart_path)
+    await _run_blocking(plot_day_of_week_analysis, df, chart_path)
 
     # Send chart
     with open(chart_path, 'rb') as chart:
@@ -212,29 +194,20 @@ async def _generate_weekday_analysis(query, user_id):
 
 async def _generate_spending_heatmap(query, user_id):
     """Generate spending heatmap."""
-    from core.database import Session
-    from core.repository.BankAccountRepository import BankAccountRepository
-    from core.repository.TransactionRepository import TransactionRepository
-
-    session = Session()
-    account_repo = BankAccountRepository(session)
-    account = account_repo.get_by_telegram_id(str(user_id))
+    df = await _run_blocking(get_or_build_df, user_id)
 
-    if not account:
+    if df is None:
         await query.edit_message_text("❌ No account found.")
         return
 
-    trx_repo = TransactionRepository(session)
-    transactions = trx_repo.get_all_transactions(account.id)
-
-    if not transactions:
+    if df.empty:
         await query.edit_message_text("❌ No transactions found for analysis.")
         return
 
     # Generate heatmap
     os.makedirs("cache/chart_cache", exist_ok=True)
     chart_path = f"cache/chart_cache/{user_id}_spending_heatmap.png"
-    plot_spending_heatmap(transactions, chart_path)
+    await _run_blocking(plot_spending_heatmap, df, chart_path)
 
     # Send chart
     with open(chart_path, 'rb') as chart:
@@ -249,29 +222,20 @@ async def _generate_spending_heatmap(query, user_id):
 
 async def _generate_spending_velocity(query, user_id):
     """Generate spending velocity analysis."""
-    from core.database import Session
-    from core.repository.BankAccountRepository import BankAccountRepository
-    from core.repository.TransactionRepository import TransactionRepository
-
-    session = Session()
-    account_repo = BankAccountRepository(session)
-    account = account_repo.get_by_telegram_id(str(user_id))
+    df = await _run_blocking(get_or_build_df, user_id)
 
-    if not account:
+    if df is None:
         await query.edit_message_text("❌ No account found.")
         return
 
-    trx_repo = TransactionRepository(session)
-    transactions = trx_repo.get_all_transactions(account.id)
-
-    if not transactions:
+    if df.empty:
         await query.edit_message_text("❌ No transactions found for analysis.")
         return
 
     # Generate velocity chart
     os.makedirs("cache/chart_cache", exist_ok=True)
     chart_path = f"cache/chart_cache/{user_id}_spending_velocity.png"
-    plot_spending_velocity(transactions, chart_path)
+    await _run_blocking(plot_spending_velocity, df, chart_path)
 
     # Send chart
     with open(chart_path, 'rb') as chart:
@@ -289,13 +253,13 @@ async def _generate_smart_insights(query, user_id):
     analysis_service = FinancialAnalysisService()
 
     # Get financial health score
-    health_score = analysis_service.calculate_financial_health_score(user_id)
+    health_score = await _run_blocking(analysis_service.calculate_financial_health_score, user_id)
 
     # Get spending anomalies
-    anomalies = analysis_service.detect_spending_anomalies(user_id)
+    anomalies = await _run_blocking(analysis_service.detect_spending_anomalies, user_id)
 
     # Get budget status
-    budget_status = analysis_service.check_budget_status(user_id)
+    budget_status = await _run_blocking(analysis_service.check_budget_status, user_id)
 
     # Build insights message
     message_parts = ["💡 <b>Smart Financial Insights</b>\n"]
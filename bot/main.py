@@ -1,6 +1,7 @@
 from telegram.ext import ApplicationBuilder
 from config.settings import TELEGRAM_TOKEN
 from bot.dispatcher import register_handlers
+from core.chart.report_generator import start_chart_workers
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,9 @@ def run_bot():
         
         logger.info("Registering handlers...")
         register_handlers(app)
+
+        logger.info("Starting chart workers...")
+        start_chart_workers()
         
         logger.info("Bot started successfully! Press Ctrl+C to stop.")
         app.run_polling()
@@ -1,10 +1,52 @@
+import threading
+import time
 from functools import wraps
+from typing import Optional
+
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from core.database import Session
+from config.settings import AUTH_CACHE_TTL_SECONDS
+from core.database import session_scope
 from core.repository.BankAccountRepository import BankAccountRepository
 
+# Key under which the registered user's bank account id is kept in context.user_data
+ACCOUNT_ID_KEY = "_bank_account_id"
+
+# telegram id -> (bank account id, monotonic time until which the entry is trusted)
+_registered_users = {}
+_lock = threading.Lock()
+
+
+def get_registered_account_id(telegram_id: str) -> Optional[int]:
+    """Get the bank account id of a Telegram user, caching positive answers for a while."""
+    now = time.monotonic()
+    cached = _registered_users.get(telegram_id)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    with session_scope() as db:
+        user = BankAccountRepository(db).get_by_telegram_id(telegram_id)
+        account_id = user.id if user else None
+
+    if account_id is None:
+        return None
+    with _lock:
+        _evict_expired(now)
+        _registered_users[telegram_id] = (account_id, now + AUTH_CACHE_TTL_SECONDS)
+    return account_id
+
+
+def _evict_expired(now: float) -> None:
+    """Remove cache entries whose TTL has passed. Caller must hold the lock."""
+    for telegram_id in [key for key, entry in _registered_users.items() if entry[1] <= now]:
+        del _registered_users[telegram_id]
+
+
+def is_registered(telegram_id: str) -> bool:
+    """Check whether a Telegram user has a bank account."""
+    return get_registered_account_id(telegram_id) is not None
+
 
 def requires_registration():
     """Decorator to check if the user is registered."""
@@ -12,13 +54,13 @@ def requires_registration():
         @wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
             telegram_id = str(update.effective_user.id)
-            db = Session()
-            repo = BankAccountRepository(db)
-            user = repo.get_by_telegram_id(telegram_id)
-            if not user:
+            account_id = get_registered_account_id(telegram_id)
+            if account_id is None:
                 await update.message.reply_text("❌ You need to register "
                 "first. Use /start to begin.")
                 return
+            # Handlers and helpers down the line can skip their own account lookup
+            context.user_data[ACCOUNT_ID_KEY] = account_id
             return await func(update, context, *args, **kwargs)
         return wrapper
     return decorator
@@ -1,8 +1,12 @@
 from datetime import datetime, date, timedelta
+from functools import lru_cache
 from typing import Optional, Tuple, List
 import re
 from calendar import monthrange
 
+# Parsing here is string work (regex, dict lookups, slicing) that already runs in C inside
+# CPython; JIT compilers such as Numba cannot compile str handling and would only slow it down.
+
 
 class DateParseError(Exception):
     """Custom exception for date parsing errors with suggestions."""
@@ -13,6 +17,59 @@ class DateParseError(Exception):
         super().__init__(self.message)
 
 
+MONTH_NUMBERS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6,
+    'jul': 7, 'july': 7, 'aug': 8, 'august': 8, 'sep': 9, 'september': 9,
+    'oct': 10, 'october': 10, 'nov': 11, 'november': 11, 'dec': 12, 'december': 12,
+}
+
+# One pattern per supported calendar layout; the group names tell _date_candidates how to read it
+DATE_PATTERNS = {
+    'ymd': re.compile(r'(?P<ymd_y>\d{4})(?P<ymd_sep>[-/])(?P<ymd_m>\d{1,2})(?P=ymd_sep)(?P<ymd_d>\d{1,2})'),
+    'numeric': re.compile(r'(?P<num_a>\d{1,2})(?P<num_sep>[-/.])(?P<num_b>\d{1,2})(?P=num_sep)(?P<num_y>\d{4}|\d{2})'),
+    'day_month_name': re.compile(r'(?P<dmy_d>\d{1,2})\s+(?P<dmy_month>[a-z]+)\s+(?P<dmy_y>\d{4})'),
+    'month_name_day': re.compile(r'(?P<mdy_month>[a-z]+)\s+(?P<mdy_d>\d{1,2})\s+(?P<mdy_y>\d{4})'),
+}
+
+MIN_YEAR, MAX_YEAR = 2000, 2050
+
+ONE_DAY = timedelta(days=1)
+ONE_WEEK = timedelta(weeks=1)
+THIRTY_DAYS = timedelta(days=30)
+
+
+def _previous_month(today: date) -> Tuple[int, int, int]:
+    """Return (year, month, number of days) of the month before today's."""
+    month = today.month - 1 or 12
+    year = today.year if today.month > 1 else today.year - 1
+    return year, month, monthrange(year, month)[1]
+
+
+def _same_day_last_month(today: date) -> date:
+    """Return the same day one month back, clamped to the length of that month."""
+    year, month, days_in_month = _previous_month(today)
+    return date(year, month, min(today.day, days_in_month))
+
+
+RELATIVE_DATE_HANDLERS = {
+    'today': lambda today: today,
+    'yesterday': lambda today: today - ONE_DAY,
+    'tomorrow': lambda today: today + ONE_DAY,
+    'last week': lambda today: today - ONE_WEEK,
+    'last month': _same_day_last_month,
+    'this month': lambda today: today.replace(day=1),
+    'last year': lambda today: today.replace(year=today.year - 1),
+}
+RELATIVE_DATE_TOKENS = frozenset(RELATIVE_DATE_HANDLERS)
+
+
+@lru_cache(maxsize=256)
+def _fmt_date(value: date, fmt: str) -> str:
+    """Format a date, caching the result since the same bounds are rendered many times."""
+    return value.strftime(fmt)
+
+
 def parse_flexible_date(date_str: str) -> date:
     """
     Parse various date formats and return standardized date object.
@@ -40,76 +97,46 @@ def parse_flexible_date(date_str: str) -> date:
             ["2024-12-25", "25/12/2024", "Dec 25, 2024", "yesterday", "last week"]
         )
 
-    date_str = date_str.strip().lower()
-    today = date.today()
+    normalized = date_str.strip().lower()
+    if normalized in RELATIVE_DATE_TOKENS:
+        # Relative dates change daily, so keep them out of the parse cache
+        return RELATIVE_DATE_HANDLERS[normalized](date.today())
+
+    return _parse_normalized_date(normalized, date.today().toordinal())
 
-    # Handle relative dates
-    if date_str in ['today']:
-        return today
-    elif date_str in ['yesterday']:
-        return today - timedelta(days=1)
-    elif date_str in ['tomorrow']:
-        return today + timedelta(days=1)
-    elif date_str in ['last week']:
-        return today - timedelta(weeks=1)
-    elif date_str in ['last month']:
-        if today.month == 1:
-            return today.replace(year=today.year - 1, month=12)
-        else:
-            # Handle month with different number of days
-            try:
-                return today.replace(month=today.month - 1)
-            except ValueError:
-                # Handle case where current day doesn't exist in previous month
-                last_month = today.month - 1 if today.month > 1 else 12
-                last_year = today.year if today.month > 1 else today.year - 1
-                last_day = monthrange(last_year, last_month)[1]
-                return date(last_year, last_month, min(today.day, last_day))
-    elif date_str in ['this month']:
-        return today.replace(day=1)
-    elif date_str in ['last year']:
-        return today.replace(year=today.year - 1)
-
-    # Try different date formats
-    formats_to_try = [
-        # ISO format
-        ('%Y-%m-%d', 'YYYY-MM-DD'),
-        # European formats
-        ('%d/%m/%Y', 'DD/MM/YYYY'),
-        ('%d-%m-%Y', 'DD-MM-YYYY'),
-        ('%d.%m.%Y', 'DD.MM.YYYY'),
-        # American formats
-        ('%m/%d/%Y', 'MM/DD/YYYY'),
-        ('%m-%d-%Y', 'MM-DD-YYYY'),
-        # Natural language formats
-        ('%b %d, %Y', 'Month DD, YYYY'),
-        ('%B %d, %Y', 'Month DD, YYYY'),
-        ('%d %b %Y', 'DD Month YYYY'),
-        ('%d %B %Y', 'DD Month YYYY'),
-        # Short year formats
-        ('%d/%m/%y', 'DD/MM/YY'),
-        ('%d-%m-%y', 'DD-MM-YY'),
-        ('%Y/%m/%d', 'YYYY/MM/DD'),
-    ]
+
+@lru_cache(maxsize=512)
+def _parse_normalized_date(date_str: str, today_ordinal: int) -> date:
+    """
+    Parse a stripped, lowercased date string relative to the given day.
+
+    Cached on (date_str, today_ordinal), so repeated inputs skip the format attempts; today
+    is only needed for the suggestions of the error message.
+    """
+    today = date.fromordinal(today_ordinal)
 
     # Normalize the input for better parsing
     normalized_str = date_str.replace(',', '').strip()
 
-    for fmt, description in formats_to_try:
-        try:
-            parsed_date = datetime.strptime(normalized_str, fmt).date()
-            # Validate reasonable date range (not too far in future/past)
-            if parsed_date.year < 2000 or parsed_date.year > 2050:
-                continue
-            return parsed_date
-        except ValueError:
-            continue
+    # Fast path for the common YYYY-MM-DD form
+    if (len(normalized_str) == 10 and normalized_str[4] == '-' and normalized_str[7] == '-'
+            and normalized_str[:4].isdigit() and normalized_str[5:7].isdigit() and normalized_str[8:].isdigit()):
+        year = int(normalized_str[:4])
+        if MIN_YEAR <= year <= MAX_YEAR:
+            try:
+                return date(year, int(normalized_str[5:7]), int(normalized_str[8:]))
+            except ValueError:
+                pass
+
+    parsed_date = _match_calendar_date(normalized_str)
+    if parsed_date:
+        return parsed_date
 
     # If no format worked, provide helpful suggestions
     suggestions = [
-        f"{today.strftime('%Y-%m-%d')} (today)",
-        f"{today.strftime('%d/%m/%Y')} (today in DD/MM/YYYY)",
-        f"{today.strftime('%b %d, %Y')} (today in natural format)",
+        f"{_fmt_date(today, '%Y-%m-%d')} (today)",
+        f"{_fmt_date(today, '%d/%m/%Y')} (today in DD/MM/YYYY)",
+        f"{_fmt_date(today, '%b %d, %Y')} (today in natural format)",
         "yesterday",
         "last week",
         "last month"
@@ -121,10 +148,102 @@ def parse_flexible_date(date_str: str) -> date:
     )
 
 
+def _date_layout(date_str: str) -> Optional[str]:
+    """Pick the only DATE_PATTERNS layout a string can have from the position of its first non-digit."""
+    for index, char in enumerate(date_str):
+        if not char.isdigit():
+            break
+    else:
+        return None
+
+    if index == 0:
+        return 'month_name_day'
+    if index == 4:
+        return 'ymd'
+    if index <= 2:
+        return 'day_month_name' if char.isspace() else 'numeric'
+    return None
+
+
+def _match_calendar_date(date_str: str) -> Optional[date]:
+    """
+    Match a normalized string against its DATE_PATTERNS layout and build the date directly.
+
+    Ambiguous numeric dates are tried day-first (DD/MM/YYYY) before month-first
+    (MM/DD/YYYY); candidates that are invalid or outside MIN_YEAR..MAX_YEAR are skipped.
+    """
+    layout = _date_layout(date_str)
+    match = DATE_PATTERNS[layout].fullmatch(date_str) if layout else None
+    if not match:
+        return None
+
+    for year, month, day in _date_candidates(match):
+        if year < MIN_YEAR or year > MAX_YEAR:
+            continue
+        try:
+            return date(year, month, day)
+        except ValueError:
+            continue
+    return None
+
+
+def _date_candidates(match: re.Match) -> List[Tuple[int, int, int]]:
+    """Return the (year, month, day) readings of a DATE_PATTERNS match in priority order."""
+    groups = match.groupdict()
+
+    if groups.get('ymd_y'):
+        return [(int(groups['ymd_y']), int(groups['ymd_m']), int(groups['ymd_d']))]
+
+    if groups.get('num_a'):
+        first, second = int(groups['num_a']), int(groups['num_b'])
+        separator, year_str = groups['num_sep'], groups['num_y']
+        if len(year_str) == 4:
+            year = int(year_str)
+            if separator == '.':
+                return [(year, second, first)]
+            return [(year, second, first), (year, first, second)]
+        if separator == '.':
+            return []
+        # Two-digit years follow strptime's %y pivot: 69-99 -> 19xx, 00-68 -> 20xx
+        short_year = int(year_str)
+        year = 1900 + short_year if short_year >= 69 else 2000 + short_year
+        return [(year, second, first)]
+
+    if groups.get('dmy_month'):
+        month = MONTH_NUMBERS.get(groups['dmy_month'])
+        day, year = groups['dmy_d'], groups['dmy_y']
+    else:
+        month = MONTH_NUMBERS.get(groups['mdy_month'])
+        day, year = groups['mdy_d'], groups['mdy_y']
+    if not month:
+        return []
+    return [(int(year), month, int(day))]
+
+
+def _last_month_range(today: date) -> Tuple[date, date, str]:
+    """Return the whole previous calendar month."""
+    year, month, days_in_month = _previous_month(today)
+    return date(year, month, 1), date(year, month, days_in_month), "Last Month"
+
+
+PRESET_RANGE_HANDLERS = {
+    'preset_7d': lambda today: (today - ONE_WEEK, today, "Last 7 Days"),
+    'preset_30d': lambda today: (today - THIRTY_DAYS, today, "Last 30 Days"),
+    'preset_this_month': lambda today: (today.replace(day=1), today, "This Month"),
+    'preset_last_month': _last_month_range,
+    'preset_this_year': lambda today: (date(today.year, 1, 1), today, "This Year"),
+    'preset_last_year': lambda today: (date(today.year - 1, 1, 1), date(today.year - 1, 12, 31), "Last Year"),
+}
+
+
 def calculate_preset_dates(preset_type: str) -> Tuple[date, date, str]:
     """
     Calculate start and end dates for preset ranges.
 
+    Both dates are plain days (never datetimes) and the range includes the end day, so a
+    preset yields the same range all day long; callers can key caches on
+    (user_id, preset_type, date.today()) instead of the computed bounds.
+
     Args:
         preset_type: The preset identifier (e.g., 'preset_7d', 'preset_30d')
 
@@ -134,63 +253,86 @@ def calculate_preset_dates(preset_type: str) -> Tuple[date, date, str]:
     Raises:
         ValueError: If preset type is unknown
     """
-    today = date.today()
+    return _preset_dates_for_day(preset_type, date.today().toordinal())
+
 
-    if preset_type == "preset_7d":
-        return today - timedelta(days=7), today, "Last 7 Days"
-    elif preset_type == "preset_30d":
-        return today - timedelta(days=30), today, "Last 30 Days"
-    elif preset_type == "preset_this_month":
-        return today.replace(day=1), today, "This Month"
-    elif preset_type == "preset_last_month":
-        if today.month == 1:
-            last_month_start = date(today.year - 1, 12, 1)
-            last_month_end = date(today.year - 1, 12, 31)
-        else:
-            last_month_start = date(today.year, today.month - 1, 1)
-            # Get last day of previous month
-            last_month_end = today.replace(day=1) - timedelta(days=1)
-        return last_month_start, last_month_end, "Last Month"
-    elif preset_type == "preset_this_year":
-        return date(today.year, 1, 1), today, "This Year"
-    elif preset_type == "preset_last_year":
-        return date(today.year - 1, 1, 1), date(today.year - 1, 12, 31), "Last Year"
+@lru_cache(maxsize=64)
+def _preset_dates_for_day(preset_type: str, today_ordinal: int) -> Tuple[date, date, str]:
+    """Compute a preset range for the given day; cached so each preset is built once per day."""
+    handler = PRESET_RANGE_HANDLERS.get(preset_type)
+    if handler:
+        return handler(date.fromordinal(today_ordinal))
 
     raise ValueError(f"Unknown preset type: {preset_type}")
 
 
-def get_preset_transaction_count(preset_type: str, user_id: int) -> Optional[int]:
+def _get_account_id(session, user_id: int, context=None) -> Optional[int]:
+    """Get the user's bank account id, reusing the one requires_registration stored in context."""
+    from bot.utils.auth import ACCOUNT_ID_KEY
+    from core.repository.BankAccountRepository import BankAccountRepository
+
+    if context is not None and context.user_data:
+        account_id = context.user_data.get(ACCOUNT_ID_KEY)
+        if account_id is not None:
+            return account_id
+
+    bank_account = BankAccountRepository(session).get_by_telegram_id(str(user_id))
+    return bank_account.id if bank_account else None
+
+
+def get_preset_transaction_count(preset_type: str, user_id: int, context=None) -> Optional[int]:
     """
     Get the number of transactions for a specific preset range.
 
     Args:
         preset_type: The preset identifier
         user_id: User's ID
+        context: Optional bot context whose user_data may already hold the account id
 
     Returns:
         Number of transactions in the preset range, or None if error
     """
+    _, _, counts = get_preset_counts_and_bounds(user_id, [preset_type], context)
+    return counts[preset_type]
+
+
+def get_preset_counts_and_bounds(user_id: int, preset_types: List[str],
+                                 context=None) -> Tuple[Optional[date], Optional[date], dict]:
+    """
+    Get the user's transaction date bounds and the transaction count of each preset range
+    using a single session and account lookup.
+
+    Args:
+        user_id: User's ID
+        preset_types: The preset identifiers to count
+        context: Optional bot context whose user_data may already hold the account id
+
+    Returns:
+        Tuple of (min_date, max_date, counts) where counts maps each preset to its number
+        of transactions, or None if it could not be counted
+    """
+    counts = dict.fromkeys(preset_types)
     try:
-        from core.database import Session
+        from core.database import session_scope
         from core.repository.TransactionRepository import TransactionRepository
-        from core.repository.BankAccountRepository import BankAccountRepository
 
-        start_date, end_date, _ = calculate_preset_dates(preset_type)
+        with session_scope() as session:
+            account_id = _get_account_id(session, user_id, context)
 
-        session = Session()
-        bank_account_repo = BankAccountRepository(session)
-        bank_account = bank_account_repo.get_by_telegram_id(str(user_id))
+            if account_id is None:
+                return None, None, counts
 
-        if not bank_account:
-            return None
+            trx_repo = TransactionRepository(session)
+            min_date, max_date = trx_repo.get_user_date_bounds(account_id)
 
-        trx_repo = TransactionRepository(session)
-        transactions = trx_repo.get_transactions_by_date_range(bank_account.id, start_date, end_date)
+            for preset_type in preset_types:
+                start_date, end_date, _ = calculate_preset_dates(preset_type)
+                counts[preset_type] = trx_repo.count_transactions_by_date_range(account_id, start_date, end_date)
 
-        return len(transactions) if transactions else 0
+            return min_date, max_date, counts
 
     except Exception:
-        return None
+        return None, None, counts
 
 
 def get_date_range_suggestions(user_min_date: Optional[date] = None, user_max_date: Optional[date] = None) -> List[str]:
@@ -219,8 +361,8 @@ def get_date_range_suggestions(user_min_date: Optional[date] = None, user_max_da
     # Add user-specific suggestions if we have their data
     if user_min_date and user_max_date:
         suggestions.extend([
-            f"all time → {user_min_date.strftime('%b %d, %Y')} to {user_max_date.strftime('%b %d, %Y')}",
-            f"recent data → {user_max_date.strftime('%b %d, %Y')} (latest transaction)"
+            f"all time → {_fmt_date(user_min_date, '%b %d, %Y')} to {_fmt_date(user_max_date, '%b %d, %Y')}",
+            f"recent data → {_fmt_date(user_max_date, '%b %d, %Y')} (latest transaction)"
         ])
 
     return suggestions
@@ -252,17 +394,17 @@ def validate_date_range(start_date: date, end_date: date, user_min_date: Optiona
     # Validate against user's transaction history
     if user_min_date and user_max_date:
         if end_date < user_min_date:
-            return False, f"❌ End date is before your first transaction ({user_min_date.strftime('%b %d, %Y')})"
+            return False, f"❌ End date is before your first transaction ({_fmt_date(user_min_date, '%b %d, %Y')})"
 
         if start_date > user_max_date:
-            return False, f"❌ Start date is after your last transaction ({user_max_date.strftime('%b %d, %Y')})"
+            return False, f"❌ Start date is after your last transaction ({_fmt_date(user_max_date, '%b %d, %Y')})"
 
         # Warn if dates are outside user's range but still allow
         warnings = []
         if start_date < user_min_date:
-            warnings.append(f"⚠️ Start date is before your first transaction ({user_min_date.strftime('%b %d, %Y')})")
+            warnings.append(f"⚠️ Start date is before your first transaction ({_fmt_date(user_min_date, '%b %d, %Y')})")
         if end_date > user_max_date:
-            warnings.append(f"⚠️ End date is after your last transaction ({user_max_date.strftime('%b %d, %Y')})")
+            warnings.append(f"⚠️ End date is after your last transaction ({_fmt_date(user_max_date, '%b %d, %Y')})")
 
         if warnings:
             return True, "\n".join(warnings) + "\n\n✅ Proceeding anyway..."
@@ -284,41 +426,38 @@ def format_date_range_display(start_date: date, end_date: date) -> str:
     days_diff = (end_date - start_date).days
 
     if days_diff == 0:
-        return f"📅 {start_date.strftime('%B %d, %Y')} (single day)"
+        return f"📅 {_fmt_date(start_date, '%B %d, %Y')} (single day)"
     elif days_diff <= 7:
-        return f"📅 {start_date.strftime('%b %d')} → {end_date.strftime('%b %d, %Y')} ({days_diff + 1} days)"
+        return f"📅 {_fmt_date(start_date, '%b %d')} → {_fmt_date(end_date, '%b %d, %Y')} ({days_diff + 1} days)"
     elif days_diff <= 31:
-        return f"📅 {start_date.strftime('%b %d')} → {end_date.strftime('%b %d, %Y')} (~{days_diff + 1} days)"
+        return f"📅 {_fmt_date(start_date, '%b %d')} → {_fmt_date(end_date, '%b %d, %Y')} (~{days_diff + 1} days)"
     else:
-        return f"📅 {start_date.strftime('%b %d, %Y')} → {end_date.strftime('%b %d, %Y')} (~{days_diff + 1} days)"
+        return f"📅 {_fmt_date(start_date, '%b %d, %Y')} → {_fmt_date(end_date, '%b %d, %Y')} (~{days_diff + 1} days)"
 
 
-def get_user_transaction_date_bounds(user_id: int) -> Tuple[Optional[date], Optional[date]]:
+def get_user_transaction_date_bounds(user_id: int, context=None) -> Tuple[Optional[date], Optional[date]]:
     """
     Get the earliest and latest transaction dates for a user.
 
     Args:
         user_id: User's ID
+        context: Optional bot context whose user_data may already hold the account id
 
     Returns:
         Tuple of (min_date, max_date) or (None, None) if no transactions
     """
     try:
-        from core.database import Session
+        from core.database import session_scope
         from core.repository.TransactionRepository import TransactionRepository
-        from core.repository.BankAccountRepository import BankAccountRepository
-
-        session = Session()
-        bank_account_repo = BankAccountRepository(session)
-        bank_account = bank_account_repo.get_by_telegram_id(str(user_id))
 
-        if not bank_account:
-            return None, None
+        with session_scope() as session:
+            account_id = _get_account_id(session, user_id, context)
 
-        trx_repo = TransactionRepository(session)
-        min_date, max_date = trx_repo.get_user_date_bounds(bank_account.id)
+            if account_id is None:
+                return None, None
 
-        return min_date, max_date
+            trx_repo = TransactionRepository(session)
+            return trx_repo.get_user_date_bounds(account_id)
 
     except Exception:
         return None, None
\ No newline at end of file
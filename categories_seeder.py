@@ -4,11 +4,16 @@ Category and Subcategory Seeder Script
 Populates the database with predefined categories and subcategories based on bank transaction patterns.
 """
 
+import logging
 import sys
+from collections import defaultdict
 from datetime import datetime
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
 
-from core.database import Base, engine, Session, Category, Subcategory
+from core.database import Base, engine, session_scope, Category, Subcategory
+
+logger = logging.getLogger(__name__)
 
 
 def create_tables():
@@ -17,163 +22,167 @@ def create_tables():
     print("✓ Database tables created/verified")
 
 
+def _insert_ignore(session, model):
+    """Build a multi-row INSERT that skips rows clashing with a unique key, for the bound database."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(model).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+        return postgresql_insert(model).on_conflict_do_nothing()
+    if dialect in ("mysql", "mariadb"):
+        return insert(model).prefix_with("IGNORE")
+    return insert(model)
+
+
 def seed_categories_and_subcategories():
     """Seed the database with categories and subcategories."""
-    session = Session()
-
     try:
-        # Define categories with their subcategories
-        categories_data = {
-            "Food & Dining": [
-                "Restaurants",
-                "Fast Food",
-                "Coffee & Beverages",
-                "Groceries & Supermarkets",
-                "Street Food",
-                "Bakery & Snacks"
-            ],
-            "Shopping": [
-                "Online Shopping",
-                "Retail Stores",
-                "Convenience Stores",
-                "Pharmacy",
-                "Electronics",
-                "Clothing & Fashion"
-            ],
-            "Transportation": [
-                "Public Transport",
-                "Taxi & Ride Sharing",
-                "Fuel",
-                "Parking",
-                "Vehicle Maintenance"
-            ],
-            "Health & Fitness": [
-                "Gym & Fitness",
-                "Medical Expenses",
-                "Pharmacy",
-                "Health Insurance"
-            ],
-            "Entertainment": [
-                "Movies & Recreation",
-                "Games & Apps",
-                "Books & Media",
-                "Sports & Activities"
-            ],
-            "Personal Care": [
-                "Haircut & Grooming",
-                "Beauty & Cosmetics",
-                "Spa & Wellness"
-            ],
-            "Bills & Utilities": [
-                "Bank Fees",
-                "Service Charges",
-                "Subscription Services",
-                "Insurance"
-            ],
-            "Transfers & Banking": [
-                "Bank Transfers",
-                "ATM Withdrawals",
-                "Cash Deposits",
-                "Investment Transfers"
-            ],
-            "Income": [
-                "Salary",
-                "Freelance Income",
-                "Investment Returns",
-                "Other Income"
-            ],
-            "Education": [
-                "Tuition Fees",
-                "Books & Supplies",
-                "Online Courses",
-                "Educational Services"
-            ],
-            "Travel": [
-                "Accommodation",
-                "Transportation",
-                "Food & Dining",
-                "Souvenirs & Shopping"
+        with session_scope() as session:
+            # Define categories with their subcategories
+            categories_data = {
+                "Food & Dining": [
+                    "Restaurants",
+                    "Fast Food",
+                    "Coffee & Beverages",
+                    "Groceries & Supermarkets",
+                    "Street Food",
+                    "Bakery & Snacks"
+                ],
+                "Shopping": [
+                    "Online Shopping",
+                    "Retail Stores",
+                    "Convenience Stores",
+                    "Pharmacy",
+                    "Electronics",
+                    "Clothing & Fashion"
+                ],
+                "Transportation": [
+                    "Public Transport",
+                    "Taxi & Ride Sharing",
+                    "Fuel",
+                    "Parking",
+                    "Vehicle Maintenance"
+                ],
+                "Health & Fitness": [
+                    "Gym & Fitness",
+                    "Medical Expenses",
+                    "Pharmacy",
+                    "Health Insurance"
+                ],
+                "Entertainment": [
+                    "Movies & Recreation",
+                    "Games & Apps",
+                    "Books & Media",
+                    "Sports & Activities"
+                ],
+                "Personal Care": [
+                    "Haircut & Grooming",
+                    "Beauty & Cosmetics",
+                    "Spa & Wellness"
+                ],
+                "Bills & Utilities": [
+                    "Bank Fees",
+                    "Service Charges",
+                    "Subscription Services",
+                    "Insurance"
+                ],
+                "Transfers & Banking": [
+                    "Bank Transfers",
+                    "ATM Withdrawals",
+                    "Cash Deposits",
+                    "Investment Transfers"
+                ],
+                "Income": [
+                    "Salary",
+                    "Freelance Income",
+                    "Investment Returns",
+                    "Other Income"
+                ],
+                "Education": [
+                    "Tuition Fees",
+                    "Books & Supplies",
+                    "Online Courses",
+                    "Educational Services"
+                ],
+                "Travel": [
+                    "Accommodation",
+                    "Transportation",
+                    "Food & Dining",
+                    "Souvenirs & Shopping"
+                ]
+            }
+
+            print("Starting category and subcategory seeding...")
+
+            # Load what already exists up front instead of querying row by row
+            existing_categories = set(session.scalars(select(Category.name)))
+            new_category_names = [name for name in categories_data if name not in existing_categories]
+            if new_category_names:
+                session.execute(_insert_ignore(session, Category), [{'name': name} for name in new_category_names])
+
+            category_ids = dict(session.execute(select(Category.name, Category.id)).all())
+            existing_subcategories = set(session.execute(select(Subcategory.category_id, Subcategory.name)).all())
+            new_subcategories = [
+                {'name': subcategory_name, 'category_id': category_ids[category_name]}
+                for category_name, subcategory_names in categories_data.items()
+                for subcategory_name in subcategory_names
+                if (category_ids[category_name], subcategory_name) not in existing_subcategories
             ]
-        }
-
-        print("Starting category and subcategory seeding...")
-
-        for category_name, subcategory_names in categories_data.items():
-            # Create or get category
-            category = session.query(Category).filter_by(name=category_name).first()
-            if not category:
-                category = Category(name=category_name)
-                session.add(category)
-                session.flush()  # Flush to get the ID
-                print(f"✓ Created category: {category_name}")
-            else:
-                print(f"→ Category already exists: {category_name}")
-
-            # Create subcategories
-            for subcategory_name in subcategory_names:
-                subcategory = session.query(Subcategory).filter_by(
-                    name=subcategory_name,
-                    category_id=category.id
-                ).first()
-
-                if not subcategory:
-                    subcategory = Subcategory(
-                        name=subcategory_name,
-                        category_id=category.id
-                    )
-                    session.add(subcategory)
-                    print(f"  ✓ Created subcategory: {subcategory_name}")
-                else:
-                    print(f"  → Subcategory already exists: {subcategory_name}")
-
-        session.commit()
-        print("\n✅ All categories and subcategories have been seeded successfully!")
-
-        # Print summary
-        total_categories = session.query(Category).count()
-        total_subcategories = session.query(Subcategory).count()
-        print(f"📊 Summary: {total_categories} categories, {total_subcategories} subcategories")
+            if new_subcategories:
+                session.execute(insert(Subcategory), new_subcategories)
+
+            for name in new_category_names:
+                logger.debug("Created category: %s", name)
+            for subcategory in new_subcategories:
+                logger.debug("Created subcategory: %s", subcategory['name'])
+
+            print(f"✓ Created {len(new_category_names)} categories "
+                  f"({len(categories_data) - len(new_category_names)} already existed)")
+            print(f"✓ Created {len(new_subcategories)} subcategories")
+
+            session.commit()
+            print("\n✅ All categories and subcategories have been seeded successfully!")
+
+            # Print summary
+            total_categories = session.query(Category).count()
+            total_subcategories = session.query(Subcategory).count()
+            print(f"📊 Summary: {total_categories} categories, {total_subcategories} subcategories")
 
     except IntegrityError as e:
-        session.rollback()
         print(f"❌ Integrity error occurred: {e}")
         sys.exit(1)
     except Exception as e:
-        session.rollback()
         print(f"❌ An error occurred: {e}")
         sys.exit(1)
-    finally:
-        session.close()
 
 
 def display_seeded_data():
     """Display all seeded categories and subcategories."""
-    session = Session()
-
     try:
-        print("\n" + "=" * 60)
-        print("SEEDED CATEGORIES AND SUBCATEGORIES")
-        print("=" * 60)
-
-        categories = session.query(Category).order_by(Category.name).all()
-
-        for category in categories:
-            print(f"\n📁 {category.name} (ID: {category.id})")
-            subcategories = session.query(Subcategory).filter_by(
-                category_id=category.id
-            ).order_by(Subcategory.name).all()
-
-            for subcategory in subcategories:
-                print(f"   └── {subcategory.name} (ID: {subcategory.id})")
+        with session_scope() as session:
+            categories = session.query(Category).order_by(Category.name).all()
+            subcategories_by_category = defaultdict(list)
+            for subcategory in session.query(Subcategory).order_by(Subcategory.name):
+                subcategories_by_category[subcategory.category_id].append(subcategory)
+
+            # Build the listing first and write it out once
+            lines = ["", "=" * 60, "SEEDED CATEGORIES AND SUBCATEGORIES", "=" * 60]
+            for category in categories:
+                lines.append(f"\n📁 {category.name} (ID: {category.id})")
+                for subcategory in subcategories_by_category[category.id]:
+                    lines.append(f"   └── {subcategory.name} (ID: {subcategory.id})")
+            print("\n".join(lines))
 
     except Exception as e:
         print(f"❌ Error displaying data: {e}")
-    finally:
-        session.close()
 
 
 def main():
-    """Main function to run the seeder."""
+    """Main function to run the seeder. Pass -v to list every created row."""
+    logging.basicConfig(level=logging.DEBUG if "-v" in sys.argv[1:] else logging.WARNING, format="  %(message)s")
+
     print("🌱 Category and Subcategory Seeder")
     print("=" * 40)
 
@@ -1,4 +1,6 @@
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict
 
 # Load environment variables with fallbacks
@@ -11,44 +13,97 @@ def load_env_with_fallback():
         # If python-dotenv is not available, just use os.getenv
         pass
 
-load_env_with_fallback()
-
-TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-# Default settings for missing environment variables
-if not DATABASE_URL:
-    DATABASE_URL = "sqlite:///./finance_bot.db"
-
-if not TELEGRAM_TOKEN:
-    print("⚠️  WARNING: TELEGRAM_TOKEN not set. Bot will not function without it.")
-
-# Chart and cache configuration
-CHART_CACHE_DIR = os.getenv("CHART_CACHE_DIR", "cache/chart_cache")
-UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
-
-# Financial analysis settings
-DEFAULT_ANALYSIS_DAYS = int(os.getenv("DEFAULT_ANALYSIS_DAYS", "90"))
-MAX_BUDGET_CATEGORIES = int(os.getenv("MAX_BUDGET_CATEGORIES", "20"))
-MAX_FINANCIAL_GOALS = int(os.getenv("MAX_FINANCIAL_GOALS", "10"))
-
-# Anomaly detector configuration
-ANOMALY_MODEL_DIR = os.getenv("ANOMALY_MODEL_DIR", "models")
-ENABLE_ANOMALY_DETECTOR = os.getenv("ENABLE_ANOMALY_DETECTOR", "True").lower() == "true"
-
-# Create directories if they don't exist
-try:
-    os.makedirs(CHART_CACHE_DIR, exist_ok=True)
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-    os.makedirs(ANOMALY_MODEL_DIR, exist_ok=True)
-except Exception as e:
-    print(f"Warning: Could not create directories: {e}")
-
-# App configuration
-APP_CONFIG = {
-    'max_file_size_mb': int(os.getenv("MAX_FILE_SIZE_MB", "10")),
-    'session_timeout_hours': int(os.getenv("SESSION_TIMEOUT_HOURS", "24")),
-    'enable_debug_logging': os.getenv("ENABLE_DEBUG_LOGGING", "False").lower() == "true",
-    'chart_quality': os.getenv("CHART_QUALITY", "high"),  # low, medium, high
-    'default_currency': os.getenv("DEFAULT_CURRENCY", "IDR"),
-}
+
+@dataclass(frozen=True)
+class Settings:
+    """Application settings resolved from the environment."""
+    telegram_token: str
+    database_url: str
+
+    # Chart and cache configuration
+    chart_cache_dir: str
+    upload_dir: str
+    df_cache_ttl_seconds: int
+    chart_cache_ttl_seconds: int
+    auth_cache_ttl_seconds: int
+
+    # Financial analysis settings
+    default_analysis_days: int
+    max_budget_categories: int
+    max_financial_goals: int
+
+    # Anomaly detector configuration
+    anomaly_model_dir: str
+    enable_anomaly_detector: bool
+
+    # App configuration
+    app_config: Dict
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Resolve the settings once per process.
+
+    The .env file is parsed, the environment read and the working directories created on the
+    first call only; later calls return the same Settings instance.
+    """
+    load_env_with_fallback()
+
+    settings = Settings(
+        telegram_token=os.getenv("TELEGRAM_TOKEN"),
+        # Default settings for missing environment variables
+        database_url=os.getenv("DATABASE_URL") or "sqlite:///./finance_bot.db",
+        chart_cache_dir=os.getenv("CHART_CACHE_DIR", "cache/chart_cache"),
+        upload_dir=os.getenv("UPLOAD_DIR", "uploads"),
+        df_cache_ttl_seconds=int(os.getenv("DF_CACHE_TTL_SECONDS", "600")),
+        chart_cache_ttl_seconds=int(os.getenv("CHART_CACHE_TTL_SECONDS", "3600")),
+        auth_cache_ttl_seconds=int(os.getenv("AUTH_CACHE_TTL_SECONDS", "300")),
+        default_analysis_days=int(os.getenv("DEFAULT_ANALYSIS_DAYS", "90")),
+        max_budget_categories=int(os.getenv("MAX_BUDGET_CATEGORIES", "20")),
+        max_financial_goals=int(os.getenv("MAX_FINANCIAL_GOALS", "10")),
+        anomaly_model_dir=os.getenv("ANOMALY_MODEL_DIR", "models"),
+        enable_anomaly_detector=os.getenv("ENABLE_ANOMALY_DETECTOR", "True").lower() == "true",
+        app_config={
+            'max_file_size_mb': int(os.getenv("MAX_FILE_SIZE_MB", "10")),
+            'session_timeout_hours': int(os.getenv("SESSION_TIMEOUT_HOURS", "24")),
+            'enable_debug_logging': os.getenv("ENABLE_DEBUG_LOGGING", "False").lower() == "true",
+            'chart_quality': os.getenv("CHART_QUALITY", "high"),  # low, medium, high
+            'default_currency': os.getenv("DEFAULT_CURRENCY", "IDR"),
+        },
+    )
+
+    if not settings.telegram_token:
+        print("⚠️  WARNING: TELEGRAM_TOKEN not set. Bot will not function without it.")
+
+    # Create directories if they don't exist
+    try:
+        os.makedirs(settings.chart_cache_dir, exist_ok=True)
+        os.makedirs(settings.upload_dir, exist_ok=True)
+        os.makedirs(settings.anomaly_model_dir, exist_ok=True)
+    except Exception as e:
+        print(f"Warning: Could not create directories: {e}")
+
+    return settings
+
+
+# Module-level names kept for existing imports
+_settings = get_settings()
+
+TELEGRAM_TOKEN = _settings.telegram_token
+DATABASE_URL = _settings.database_url
+
+CHART_CACHE_DIR = _settings.chart_cache_dir
+UPLOAD_DIR = _settings.upload_dir
+DF_CACHE_TTL_SECONDS = _settings.df_cache_ttl_seconds
+CHART_CACHE_TTL_SECONDS = _settings.chart_cache_ttl_seconds
+AUTH_CACHE_TTL_SECONDS = _settings.auth_cache_ttl_seconds
+
+DEFAULT_ANALYSIS_DAYS = _settings.default_analysis_days
+MAX_BUDGET_CATEGORIES = _settings.max_budget_categories
+MAX_FINANCIAL_GOALS = _settings.max_financial_goals
+
+ANOMALY_MODEL_DIR = _settings.anomaly_model_dir
+ENABLE_ANOMALY_DETECTOR = _settings.enable_anomaly_detector
+
+APP_CONFIG = _settings.app_config
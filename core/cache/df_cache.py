@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DF_CACHE_TTL_SECONDS
+from core.chart.advanced_visuals import transactions_to_frame
+from core.database import Session
+from core.repository.BankAccountRepository import BankAccountRepository
+from core.repository.TransactionRepository import TransactionRepository
+
+# account id -> (transactions version, expires at, DataFrame)
+_frames = {}
+_lock = threading.Lock()
+
+
+def get_or_build_df(user_id) -> Optional[pd.DataFrame]:
+    """
+    Get a user's transactions as a DataFrame, reusing a cached copy while it is fresh.
+
+    The cached frame is keyed by the account and its transactions version (row count and
+    highest id), so new uploads and deletions rebuild it immediately. Callers must treat
+    the returned frame as read-only since it is shared between requests.
+
+    Args:
+        user_id: User's Telegram ID
+
+    Returns:
+        DataFrame of the user's transactions, or None if the user has no account
+    """
+    session = Session()
+    try:
+        account = BankAccountRepository(session).get_by_telegram_id(str(user_id))
+        if not account:
+            return None
+
+        trx_repo = TransactionRepository(session)
+        version = trx_repo.get_transactions_version(account.id)
+        now = time.monotonic()
+
+        with _lock:
+            cached = _frames.get(account.id)
+        if cached and cached[0] == version and cached[1] > now:
+            return cached[2]
+
+        df = transactions_to_frame(trx_repo.get_rows_for_charts(account.id))
+
+        with _lock:
+            _evict_expired(now)
+            _frames[account.id] = (version, now + DF_CACHE_TTL_SECONDS, df)
+        return df
+    finally:
+        session.close()
+
+
+def get_user_transaction_arrays(user_id) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Get a user's transactions as contiguous NumPy arrays for numeric kernels.
+
+    Built from the cached DataFrame, so it costs no extra query while the frame is fresh.
+    Numeric loops over these arrays (vectorized or compiled) avoid per-row Python objects.
+
+    Args:
+        user_id: User's Telegram ID
+
+    Returns:
+        Tuple of (day ordinals as int32, net amounts in cents as int64 with incoming
+        positive and outgoing negative, category ids as int32 with -1 for uncategorized),
+        or None if the user has no account
+    """
+    df = get_or_build_df(user_id)
+    if df is None:
+        return None
+
+    ordinals = (df['date'].values.astype('datetime64[D]').astype(np.int64)
+                + pd.Timestamp('1970-01-01').toordinal()).astype(np.int32)
+    cents = np.rint((df['incoming'].to_numpy(dtype=np.float64) - df['outgoing'].to_numpy(dtype=np.float64)) * 100)
+    category_ids = df['category_id'].astype(np.float64).fillna(-1).to_numpy(dtype=np.int32)
+    return (np.ascontiguousarray(ordinals), np.ascontiguousarray(cents.astype(np.int64)),
+            np.ascontiguousarray(category_ids))
+
+
+def invalidate_user_frame(account_id: int) -> None:
+    """Drop the cached DataFrame of an account, e.g. after its transactions were re-categorized."""
+    with _lock:
+        _frames.pop(account_id, None)
+
+
+def _evict_expired(now: float) -> None:
+    """Remove cache entries whose TTL has passed. Caller must hold the lock."""
+    for account_id in [key for key, entry in _frames.items() if entry[1] <= now]:
+        del _frames[account_id]
@@ -1,54 +1,341 @@
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+import matplotlib
+
+# Charts are only ever written to PNG files, so skip GUI backends and pyplot's open-figure warning
+matplotlib.use('Agg', force=True)
+matplotlib.rcParams['figure.max_open_warning'] = 0
+
+# Figure, its Agg canvas and the tick helpers are imported where charts are drawn: they take
+# longer to import than the rest of the module, and most bot commands never draw a chart
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-import seaborn as sns
-from collections import defaultdict, Counter
-import calendar
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
+import operator
 import os
+import threading
+import time
+import weakref
+from types import SimpleNamespace
+
+from config.settings import CHART_CACHE_TTL_SECONDS
+
+FRAME_COLUMNS = ['date', 'description', 'incoming', 'outgoing', 'balance', 'category_id', 'category']
+
+# Charts are sent as Telegram photos, which are downscaled well below 300 DPI renders
+CHART_DPI = 120
+# Charts read through their labels (heatmap cells, budget percentages) keep a bit more detail
+TEXT_CHART_DPI = 150
+# zlib level 1 encodes several times faster than the default, for slightly larger files
+PNG_OPTIONS = {'optimize': False, 'compress_level': 1}
+
+# Category trend line colors for 1 to 5 plotted categories
+TOP_CATEGORY_COLORS = {n: matplotlib.colormaps['Set3'](np.linspace(0, 1, n)) for n in range(1, 6)}
+
+# Fewest transactions a chart needs to say anything; below it the fallback chart is drawn instead
+MIN_PLOT_N = {
+    'spending_heatmap': 7,
+    'spending_velocity': 14,
+    'weekday_analysis': 7,
+    'category_trends': 3,
+}
+# Fallback charts only carry a line of text
+FALLBACK_DPI = 100
+
+# id(frame) -> (weak reference to the frame, {name: value derived from it})
+_frame_cache = {}
+_frame_lock = threading.Lock()
+
+# Per-thread CategorizationService; its session is not safe to share between threads
+_categorizers = threading.local()
+
+# Per-thread chart key -> (figure, axes as returned by subplots, original axes grid slots, margins)
+_figures = threading.local()
+
+
+def transactions_to_frame(transactions):
+    """
+    Convert transactions (ORM objects, Core rows or dicts) into a DataFrame usable by every plot function.
+
+    A DataFrame is returned as-is, so callers can build the frame once and reuse it across charts.
+    Outgoing amounts are made positive and missing amounts become 0.
+    """
+    if isinstance(transactions, pd.DataFrame):
+        return transactions
+
+    if transactions and hasattr(transactions[0], '_fields'):
+        # SQLAlchemy Core rows: build the frame straight from the tuples
+        df = pd.DataFrame.from_records(transactions, columns=list(transactions[0]._fields))
+        df = df.reindex(columns=FRAME_COLUMNS)
+        df['category'] = df['category'].astype(object).where(df['category'].notna(), None)
+        return _finalize_frame(df)
+
+    if not transactions:
+        return _finalize_frame(pd.DataFrame(columns=FRAME_COLUMNS))
+
+    df = _make_extractor(transactions[0])(transactions)
+    df['category'] = df['category'].map(_category_name)
+    return _finalize_frame(df)
+
+
+def _make_extractor(sample):
+    """
+    Build the column extractor for lists of transactions shaped like sample.
+
+    The dict-or-object decision and the probe for optional attributes happen here, once, so the
+    returned function reads every row without branching. Dicts are aligned by pandas, since they
+    need not all carry the same keys; objects are read with a single attrgetter call per row.
+    Absent fields come back as None.
+    """
+    if isinstance(sample, dict):
+        def extract(transactions):
+            df = pd.DataFrame.from_records(transactions).reindex(columns=FRAME_COLUMNS)
+            for name in ('description', 'category'):
+                df[name] = df[name].astype(object).where(df[name].notna(), None)
+            return df
+        return extract
+
+    optional = [name for name in ('description', 'category_id', 'category') if hasattr(sample, name)]
+    columns = ['date', 'incoming', 'outgoing', 'balance', *optional]
+    get_fields = operator.attrgetter(*columns)
+
+    def extract(transactions):
+        df = pd.DataFrame.from_records(list(map(get_fields, transactions)), columns=columns)
+        for name in ('description', 'category_id', 'category'):
+            if name not in optional:
+                df[name] = None
+        return df[FRAME_COLUMNS]
+    return extract
+
+
+def _category_name(category):
+    """Return the display name of a category relationship or value, or None when missing."""
+    if not category:
+        return None
+    return category.name if hasattr(category, 'name') else str(category)
+
+
+def _finalize_frame(df):
+    """Normalize dtypes shared by all transaction frames."""
+    df['date'] = pd.to_datetime(df['date'])
+    # Missing amounts become 0 and outgoing amounts positive, column-wide rather than per row
+    df['incoming'] = df['incoming'].to_numpy(dtype=np.float64, na_value=0.0)
+    df['outgoing'] = np.abs(df['outgoing'].to_numpy(dtype=np.float64, na_value=0.0))
+    # Balances are only ever drawn, never summed, so single precision is precise to well below a pixel
+    df['balance'] = df['balance'].to_numpy(dtype=np.float32, na_value=np.nan)
+    df['category_id'] = df['category_id'].astype(object).where(df['category_id'].notna(), None)
+    return df
+
+
+def _reuse_figure(key, nrows=1, ncols=1, figsize=None):
+    """
+    Get the figure and axes of a chart, reusing the ones from its previous render.
+
+    The figure is created once per thread on an Agg canvas, outside pyplot's figure registry,
+    with a tight layout engine so saving it needs no bbox_inches='tight' second pass. On reuse
+    its axes are cleared and put back in their original grid slots and axes added while drawing
+    (such as colorbars) are removed, so the render matches one on a new figure.
+    """
+    cache = getattr(_figures, 'cache', None)
+    if cache is None:
+        cache = _figures.cache = {}
+
+    entry = cache.get(key)
+    if entry is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=figsize, layout='tight')
+        FigureCanvasAgg(fig)
+        axes = fig.subplots(nrows, ncols)
+        slots = [(a, a.get_subplotspec()) for a in fig.axes]
+        margins = {name: getattr(fig.subplotpars, name)
+                   for name in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')}
+        entry = cache[key] = (fig, axes, slots, margins)
+    else:
+        fig, axes, slots, margins = entry
+        own_axes = [a for a, _ in slots]
+        for extra in [a for a in fig.axes if a not in own_axes]:
+            extra.remove()
+        for a, spec in slots:
+            a.clear()
+            # clear() keeps what pie() changes, so reset it to the subplots() defaults
+            a.set_aspect('auto')
+            a.set_frame_on(True)
+            a.set_axis_on()
+            a.set_subplotspec(spec)
+        fig.subplots_adjust(**margins)
+        if figsize is not None:
+            fig.set_size_inches(figsize)
+    return entry[0], entry[1]
+
+
+def _plot_series(ax, dates, values, **kwargs):
+    """
+    Plot a line series, collapsing it to a per-pixel-column envelope when it has far more
+    points than the canvas has columns.
+
+    Series of up to four points per column are drawn as-is. Longer ones are binned into one
+    column per pixel and drawn as the min/max band plus the mean line of each bin.
+    """
+    values = np.asarray(values, dtype=float)
+    width = int(ax.figure.get_figwidth() * ax.figure.get_dpi())
+    if len(values) <= 4 * width:
+        return ax.plot(dates, values, **kwargs)
+
+    starts = np.linspace(0, len(values), width + 1, dtype=int)[:-1]
+    missing = np.isnan(values)
+    mins = np.fmin.reduceat(values, starts)
+    maxs = np.fmax.reduceat(values, starts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (np.add.reduceat(np.where(missing, 0.0, values), starts)
+                 / np.add.reduceat(~missing, starts))
+
+    col_dates = np.asarray(dates)[starts]
+    lines = ax.plot(col_dates, means, **kwargs)
+    ax.fill_between(col_dates, mins, maxs, color=lines[0].get_color(),
+                    alpha=kwargs.get('alpha', 1.0) * 0.3, linewidth=0)
+    return lines
+
+
+def _save_chart(fig, output_path, dpi=CHART_DPI, key=None):
+    """Write a chart figure to a PNG file with fast compression, recording the key it was drawn for."""
+    fig.savefig(output_path, dpi=dpi, pil_kwargs=PNG_OPTIONS)
+    if key is not None:
+        with open(output_path + '.key', 'w') as f:
+            f.write(key)
+
+
+def _chart_key(df, *params):
+    """Fingerprint the transactions and parameters a chart is drawn from."""
+    digest = hashlib.blake2b(_derived(df, 'digest', _frame_digest), digest_size=16)
+    digest.update(repr(params).encode())
+    return digest.hexdigest()
+
+
+def _frame_digest(df):
+    """Hash the contents of a transactions frame, once per frame for all charts drawn from it."""
+    digest = hashlib.blake2b(digest_size=16)
+    # Numeric columns are hashed straight from their buffers; only the object columns need pandas hashing
+    digest.update(np.ascontiguousarray(df['date'].to_numpy(dtype='datetime64[ns]').view('i8')))
+    for column in ('incoming', 'outgoing', 'balance'):
+        digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=np.float64)))
+    digest.update(pd.util.hash_pandas_object(df[['description', 'category_id', 'category']],
+                                             index=False).to_numpy())
+    return digest.digest()
+
+
+def _is_rendered(output_path, key):
+    """
+    Check whether output_path already holds the chart drawn for key, so it need not be redrawn.
+
+    Renders older than CHART_CACHE_TTL_SECONDS are drawn again, which also bounds how long a
+    chart can lag behind changes outside its key, such as renamed categories.
+    """
+    try:
+        with open(output_path + '.key') as f:
+            if f.read() != key:
+                return False
+        return os.path.getmtime(output_path) > time.time() - CHART_CACHE_TTL_SECONDS
+    except OSError:
+        return False
+
+
+def _derived(df, name, compute):
+    """
+    Get compute(df), computed once per transactions frame and name.
+
+    Results are keyed by the frame object, so every chart drawn from the same shared frame
+    (see core.cache.df_cache and render_all) reuses them. Frames are treated as read-only,
+    and entries are dropped once their frame has been garbage collected.
+    """
+    key = id(df)
+    with _frame_lock:
+        cached = _frame_cache.get(key)
+    if cached is not None and cached[0]() is df and name in cached[1]:
+        return cached[1][name]
+
+    value = compute(df)
+
+    with _frame_lock:
+        for stale in [k for k, (ref, _) in _frame_cache.items() if ref() is None]:
+            del _frame_cache[stale]
+        entry = _frame_cache.get(key)
+        if entry is None or entry[0]() is not df:
+            entry = _frame_cache[key] = (weakref.ref(df), {})
+        entry[1][name] = value
+    return value
+
+
+def _sorted_by_date(df):
+    """Get the frame's rows in date order (ties keep their order), sorted once per frame."""
+    return _derived(df, 'sorted', _sort_by_date)
+
+
+def _sort_by_date(df):
+    """Sort a frame by date, skipping the sort when it is already in date order."""
+    if df['date'].is_monotonic_increasing:
+        return df
+    order = np.argsort(df['date'].to_numpy(), kind='stable')
+    return df.take(order)
+
+
+def _daily_aggregates(df):
+    """Get the daily and monthly spending series of a transactions frame, computed once per frame."""
+    return _derived(df, 'daily', _compute_daily_aggregates)
+
+
+def _compute_daily_aggregates(df):
+    """Aggregate spending by day (with its 7-day average and running total) and by month."""
+    # Grouping sorts the days, so the running total is a plain cumulative sum of the values
+    daily_spending = df.groupby(df['date'].dt.normalize())['outgoing'].sum()
+    month = df['date'].dt.to_period('M')
+    return SimpleNamespace(
+        daily_spending=daily_spending,
+        ma7=daily_spending.rolling(window=7, min_periods=1).mean(),
+        cumulative=np.cumsum(daily_spending.to_numpy()),
+        spending_monthly=df.groupby(month)['outgoing'].sum(),
+        income_monthly=df.groupby(month)['incoming'].sum(),
+    )
 
 
 def plot_spending_trends(transactions, output_path='cache/chart_cache/spending_trends.png', period='monthly'):
     """Plot spending trends over time with moving averages."""
-    if not transactions:
+    df = transactions_to_frame(transactions)
+    if df.empty:
         return
     
     # Ensure directory exists
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    try:
-        # Convert to DataFrame for easier manipulation
-        df = pd.DataFrame([{
-            'date': t.date if hasattr(t, 'date') else t['date'],
-            'outgoing': abs(t.outgoing or 0) if hasattr(t, 'outgoing') else abs(t['outgoing'] or 0),
-            'incoming': t.incoming or 0 if hasattr(t, 'incoming') else t['incoming'] or 0
-        } for t in transactions])
+    key = _chart_key(df, 'spending_trends', period)
+    if _is_rendered(output_path, key):
+        return
 
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.sort_values('date')
+    try:
+        aggregates = _daily_aggregates(df)
 
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+        fig, (ax1, ax2) = _reuse_figure('spending_trends', 2, 1, figsize=(12, 10))
 
         if period == 'daily':
             # Daily spending with 7-day moving average - aggregate by date
-            daily_spending = df.groupby(df['date'].dt.date)['outgoing'].sum()
-            daily_spending.index = pd.to_datetime(daily_spending.index)
+            daily_spending = aggregates.daily_spending
 
-            ax1.plot(daily_spending.index, daily_spending.values, alpha=0.7, label='Daily Spending')
+            _plot_series(ax1, daily_spending.index, daily_spending.values, alpha=0.7, label='Daily Spending')
 
             # 7-day moving average
             if len(daily_spending) >= 7:
-                ma_7 = daily_spending.rolling(window=7).mean()
-                ax1.plot(ma_7.index, ma_7.values, color='red', linewidth=2, label='7-Day Average')
+                # Only full 7-day windows are drawn
+                ma_7 = aggregates.ma7.iloc[6:]
+                _plot_series(ax1, ma_7.index, ma_7.values, color='red', linewidth=2, label='7-Day Average')
 
             ax1.set_title('Daily Spending Trends')
             ax1.set_ylabel('Amount (IDR)')
 
         elif period == 'weekly':
             # Weekly spending - aggregate by week
-            df['week'] = df['date'].dt.to_period('W')
-            weekly_spending = df.groupby('week')['outgoing'].sum()
+            weekly_spending = df.groupby(df['date'].dt.to_period('W'))['outgoing'].sum()
             weekly_dates = [week.start_time for week in weekly_spending.index]
 
             ax1.bar(weekly_dates, weekly_spending.values, alpha=0.7, label='Weekly Spending')
@@ -57,9 +344,8 @@ def plot_spending_trends(transactions, output_path='cache/chart_cache/spending_t
 
         else:  # monthly
             # Monthly spending - aggregate by month
-            df['month'] = df['date'].dt.to_period('M')
-            monthly_spending = df.groupby('month')['outgoing'].sum()
-            monthly_income = df.groupby('month')['incoming'].sum()
+            monthly_spending = aggregates.spending_monthly
+            monthly_income = aggregates.income_monthly
 
             months = [month.start_time for month in monthly_spending.index]
 
@@ -73,21 +359,12 @@ def plot_spending_trends(transactions, output_path='cache/chart_cache/spending_t
 
         # Spending velocity (second subplot)
         if len(df) > 1:
-            # Aggregate by date for cumulative calculation
-            daily_totals = df.groupby(df['date'].dt.date)['outgoing'].sum().reset_index()
-            daily_totals['date'] = pd.to_datetime(daily_totals['date'])
-            daily_totals = daily_totals.sort_values('date')
-
-            daily_totals['cumulative_spending'] = daily_totals['outgoing'].cumsum()
-
-            ax2.plot(daily_totals['date'], daily_totals['cumulative_spending'], color='orange', linewidth=2)
+            _plot_series(ax2, aggregates.daily_spending.index, aggregates.cumulative, color='orange', linewidth=2)
             ax2.set_title('Cumulative Spending Over Time')
             ax2.set_ylabel('Cumulative Amount (IDR)')
             ax2.grid(True, alpha=0.3)
 
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        _save_chart(fig, output_path, key=key)
 
     except Exception as e:
         print(f"Error generating spending trends: {e}")
@@ -97,81 +374,58 @@ def plot_spending_trends(transactions, output_path='cache/chart_cache/spending_t
 
 def plot_category_trends(transactions, output_path='cache/chart_cache/category_trends.png'):
     """Plot spending trends by category over time with improved categorization."""
-    if not transactions:
+    if _has_too_few(transactions, 'category_trends'):
+        _create_fallback_chart(output_path, "Category Trends", _too_few_message('category_trends'))
+        return
+
+    df = transactions_to_frame(transactions)
+    if df.empty:
+        return
+
+    key = _chart_key(df, 'category_trends')
+    if _is_rendered(output_path, key):
         return
 
     try:
         # Group by category and month with proper aggregation
-        category_data = defaultdict(lambda: defaultdict(float))
-
-        for t in transactions:
-            date = t.date if hasattr(t, 'date') else t['date']
-            if isinstance(date, str):
-                date = datetime.strptime(date, '%Y-%m-%d')
-
-            month_key = date.strftime('%Y-%m')
-            outgoing = abs(t.outgoing or 0) if hasattr(t, 'outgoing') else abs(t['outgoing'] or 0)
-
-            # Improved category detection
-            category = "Uncategorized"
-
-            if hasattr(t, 'category') and t.category:
-                category = t.category.name if hasattr(t.category, 'name') else str(t.category)
-            elif hasattr(t, 'category_id') and t.category_id:
-                # Try to get category from database
-                try:
-                    from core.database import Session, Category
-                    session = Session()
-                    cat_obj = session.query(Category).filter(Category.id == t.category_id).first()
-                    if cat_obj:
-                        category = cat_obj.name
-                    session.close()
-                except:
-                    pass
-            else:
-                # Try auto-categorization based on description
-                if hasattr(t, 'description') and t.description:
-                    try:
-                        from core.services.categorization_service import CategorizationService
-                        cat_service = CategorizationService()
-                        auto_cat = cat_service.categorize_transaction(t.description)
-                        if auto_cat:
-                            category = auto_cat['category_name']
-                    except:
-                        pass
-
-            category_data[category][month_key] += outgoing
+        monthly = _extract_monthly_category_df(df, _derived(df, 'categories', _resolve_categories))
 
-        # Create plot
-        fig, ax = plt.subplots(figsize=(14, 8))
+        # Every month in the range gets a column, in calendar order, even if nothing was spent;
+        # the shared daily totals are sorted by day, so their ends bound the range without a scan
+        days = _daily_aggregates(df).daily_spending.index
+        months = pd.period_range(days[0], days[-1], freq='M')
 
-        months = sorted(set(month for cat_data in category_data.values() for month in cat_data.keys()))
+        # Rows keep the order in which categories first appear so ties rank as before
+        pivot = (monthly.groupby(['category', 'month'])['outgoing'].sum()
+                 .unstack(fill_value=0)
+                 .reindex(index=monthly['category'].unique(), columns=months, fill_value=0))
 
-        if not months:
+        # Create plot
+        fig, ax = _reuse_figure('category_trends', figsize=(14, 8))
+
+        if months.empty:
             _create_fallback_chart(output_path, "Category Trends", "No data available for category analysis")
             return
 
         # Plot top 5 categories (excluding Uncategorized if there are other categories)
-        sorted_categories = sorted(category_data.items(),
-                                   key=lambda x: sum(x[1].values()),
-                                   reverse=True)
+        totals = pivot.sum(axis=1)
 
         # If we have categorized data, exclude "Uncategorized" from top 5
-        if len([cat for cat, _ in sorted_categories if cat != "Uncategorized"]) >= 5:
-            top_categories = [cat_data for cat_data in sorted_categories if cat_data[0] != "Uncategorized"][:5]
-        else:
-            top_categories = sorted_categories[:5]
+        candidates = totals[totals.index != "Uncategorized"]
+        if len(candidates) < 5:
+            candidates = totals
+        # keep='first' breaks ties by first appearance, like a stable sort
+        top_categories = candidates.nlargest(5, keep='first').index
 
-        if not top_categories:
+        if not len(top_categories):
             _create_fallback_chart(output_path, "Category Trends", "No spending data found")
             return
 
-        colors = plt.cm.Set3(np.linspace(0, 1, len(top_categories)))
+        colors = TOP_CATEGORY_COLORS[len(top_categories)]
+        month_dates = months.to_timestamp().to_pydatetime()
 
-        for i, (category, data) in enumerate(top_categories):
-            values = [data.get(month, 0) for month in months]
-            month_dates = [datetime.strptime(month, '%Y-%m') for month in months]
-            ax.plot(month_dates, values, marker='o', linewidth=2,
+        for i, category in enumerate(top_categories):
+            ax.plot(month_dates, pivot.loc[category].values, marker='o', linewidth=2,
                     label=category, color=colors[i])
 
         ax.set_title('Spending Trends by Category')
@@ -180,14 +434,14 @@ def plot_category_trends(transactions, output_path='cache/chart_cache/category_t
         ax.grid(True, alpha=0.3)
 
         # Format x-axis
+        import matplotlib.dates as mdates
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
         ax.xaxis.set_major_locator(mdates.MonthLocator())
-        plt.xticks(rotation=45)
+        ax.tick_params(axis='x', rotation=45)
 
         # Add summary text
-        total_categories = len(category_data)
-        categorized_amount = sum(sum(data.values()) for cat, data in category_data.items() if cat != "Uncategorized")
-        uncategorized_amount = sum(category_data.get("Uncategorized", {}).values())
+        total_categories = len(pivot)
+        uncategorized_amount = totals.get("Uncategorized", 0)
 
         summary_text = f"Total Categories: {total_categories}"
         if uncategorized_amount > 0:
@@ -196,145 +450,138 @@ def plot_category_trends(transactions, output_path='cache/chart_cache/category_t
         ax.text(0.02, 0.98, summary_text, transform=ax.transAxes,
                 verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
 
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        _save_chart(fig, output_path, key=key)
 
     except Exception as e:
         print(f"Error generating category trends: {e}")
         _create_fallback_chart(output_path, "Category Trends", f"Error: {str(e)}")
 
 
-def plot_spending_heatmap(transactions, output_path='cache/chart_cache/spending_heatmap.png'):
-    """Create a calendar heatmap showing spending intensity by day."""
-    if not transactions:
-        _create_fallback_chart(output_path, "Spending Heatmap", "No transaction data available")
-        return
+def _resolve_categories(df):
+    """
+    Name the category of every transaction: its own category name, else the name of its
+    category_id, else an auto-categorization of its description, else "Uncategorized".
 
-    try:
-        # Prepare data with proper aggregation
-        daily_spending = defaultdict(float)
+    Category names are fetched with one query and each distinct description is categorized once.
+    """
+    has_name = df['category'].astype(bool)
+    has_id = ~has_name & df['category_id'].astype(bool)
+    needs_auto = ~has_name & ~has_id & df['description'].astype(bool)
 
-        for t in transactions:
-            date = t.date if hasattr(t, 'date') else t['date']
-            if isinstance(date, str):
-                date = datetime.strptime(date, '%Y-%m-%d').date()
-            elif isinstance(date, datetime):
-                date = date.date()
+    categories = pd.Series("Uncategorized", index=df.index, dtype=object)
+    categories[has_name] = df.loc[has_name, 'category']
 
-            outgoing = abs(t.outgoing or 0) if hasattr(t, 'outgoing') else abs(t['outgoing'] or 0)
-            daily_spending[date] += outgoing  # Aggregate spending by date
+    if has_id.any():
+        id_names = _lookup_category_names(df.loc[has_id, 'category_id'].unique().tolist())
+        categories[has_id] = df.loc[has_id, 'category_id'].map(id_names).fillna("Uncategorized")
 
-        if not daily_spending:
-            _create_fallback_chart(output_path, "Spending Heatmap", "No spending data found")
-            return
+    if needs_auto.any():
+        auto_names = _auto_categorize(df.loc[needs_auto, 'description'].unique().tolist())
+        categories[needs_auto] = df.loc[needs_auto, 'description'].map(auto_names).fillna("Uncategorized")
 
-        # Get full date range
-        min_date = min(daily_spending.keys())
-        max_date = max(daily_spending.keys())
-
-        # Create a more robust calendar matrix
-        calendar_data = []
-        current_date = min_date
-
-        while current_date <= max_date:
-            spending = daily_spending.get(current_date, 0)
-            calendar_data.append({
-                'date': current_date,
-                'spending': spending,
-                'weekday': current_date.weekday(),
-                'week': current_date.isocalendar()[1],
-                'year_week': f"{current_date.year}-{current_date.isocalendar()[1]:02d}"
-            })
-            current_date += timedelta(days=1)
-
-        if not calendar_data:
-            _create_fallback_chart(output_path, "Spending Heatmap", "Insufficient data for heatmap")
-            return
+    return categories
 
-        # Convert to DataFrame and aggregate properly
-        df = pd.DataFrame(calendar_data)
 
-        # Group by year_week and weekday, then sum spending to handle duplicates
-        pivot_data = df.groupby(['weekday', 'year_week'])['spending'].sum().unstack(fill_value=0)
+def _lookup_category_names(category_ids):
+    """Fetch the names of the given category ids with a single query."""
+    try:
+        from core.database import Session, Category
+        session = Session()
+        try:
+            return dict(session.query(Category.id, Category.name).filter(Category.id.in_(category_ids)).all())
+        finally:
+            session.close()
+    except Exception:
+        return {}
+
+
+def _auto_categorize(descriptions):
+    """Auto-categorize the distinct descriptions, reusing earlier results for repeated texts."""
+    try:
+        try:
+            names = {description: _auto_category_name(description) for description in descriptions}
+        finally:
+            # Give the connection back; the service keeps its category lookups for the next chart
+            cat_service = getattr(_categorizers, 'service', None)
+            if cat_service is not None:
+                cat_service.session.close()
+    except Exception:
+        return {}
 
-        # If we have too many weeks, limit to recent data
-        if len(pivot_data.columns) > 52:  # More than 1 year of data
-            pivot_data = pivot_data.iloc[:, -52:]  # Last 52 weeks
+    return {description: name for description, name in names.items() if name}
 
-        # Create heatmap
-        fig, ax = plt.subplots(figsize=(max(16, len(pivot_data.columns) * 0.3), 6))
 
-        if pivot_data.empty:
-            _create_fallback_chart(output_path, "Spending Heatmap", "No data to display")
-            return
+@lru_cache(maxsize=4096)
+def _auto_category_name(description):
+    """Get the auto-detected category name of a description, or None when nothing matches."""
+    auto_cat = _get_categorizer().categorize_transaction(description)
+    return auto_cat['category_name'] if auto_cat else None
 
-        sns.heatmap(pivot_data,
-                    cmap='Reds',
-                    ax=ax,
-                    cbar_kws={'label': 'Daily Spending (IDR)'},
-                    linewidths=0.5,
-                    fmt='.0f')
 
-        ax.set_title('Daily Spending Heatmap (by Week)')
-        ax.set_ylabel('Day of Week')
-        ax.set_xlabel('Week of Year')
+def _get_categorizer():
+    """Get this thread's CategorizationService, created on first use and kept for later charts."""
+    cat_service = getattr(_categorizers, 'service', None)
+    if cat_service is None:
+        from core.services.categorization_service import CategorizationService
+        cat_service = _categorizers.service = CategorizationService()
+    return cat_service
 
-        # Set y-axis labels
-        ax.set_yticklabels(['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'])
 
-        # Rotate x-axis labels for better readability
-        plt.xticks(rotation=45, ha='right')
+def _extract_monthly_category_df(df, categories):
+    """Reduce a transactions frame to the month period, category and outgoing amount of each row."""
+    return pd.DataFrame({
+        'month': df['date'].dt.to_period('M'),
+        'category': categories,
+        'outgoing': df['outgoing'],
+    })
 
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
 
-    except Exception as e:
-        print(f"Error generating spending heatmap: {e}")
-        _create_fallback_chart(output_path, "Spending Heatmap", f"Error: {str(e)}")
+def _weekdays(dates):
+    """Weekday numbers (Monday = 0) of a datetime64 array; 1970-01-01, day 0, was a Thursday."""
+    return ((dates.astype('datetime64[D]').view('i8') + 3) % 7).astype(np.int8)
+
+
+def _weekday_stats(weekdays, outgoing):
+    """
+    Sum, count and average the spending transactions (outgoing > 0) of each weekday.
+
+    Works on the plain weekday and amount arrays, so no filtered copy of the frame is made.
+
+    Returns:
+        Tuple of (totals, counts, means), each indexed by weekday number (Monday = 0)
+    """
+    # Non-spending rows add nothing to the totals, so only the counts need the mask
+    counts = np.bincount(weekdays[outgoing > 0], minlength=7)
+    totals = np.bincount(weekdays, weights=outgoing, minlength=7)
+    means = np.divide(totals, counts, out=np.zeros(7), where=counts > 0)
+    return totals, counts, means
 
 
 def plot_day_of_week_analysis(transactions, output_path='cache/chart_cache/weekday_analysis.png'):
     """Analyze spending patterns by day of week."""
-    if not transactions:
-        _create_fallback_chart(output_path, "Weekday Analysis", "No transaction data available")
+    if _has_too_few(transactions, 'weekday_analysis'):
+        _create_fallback_chart(output_path, "Weekday Analysis", _too_few_message('weekday_analysis'))
         return
 
-    try:
-        weekday_spending = defaultdict(list)
-
-        for t in transactions:
-            date = t.date if hasattr(t, 'date') else t['date']
-            if isinstance(date, str):
-                date = datetime.strptime(date, '%Y-%m-%d').date()
-            elif isinstance(date, datetime):
-                date = date.date()
+    df = transactions_to_frame(transactions)
+    if df.empty:
+        _create_fallback_chart(output_path, "Weekday Analysis", "No transaction data available")
+        return
 
-            outgoing = abs(t.outgoing or 0) if hasattr(t, 'outgoing') else abs(t['outgoing'] or 0)
-            if outgoing > 0:
-                weekday_spending[date.weekday()].append(outgoing)
+    key = _chart_key(df, 'weekday_analysis')
+    if _is_rendered(output_path, key):
+        return
 
-        # Calculate statistics
-        weekday_stats = {}
+    try:
+        weekday_totals, weekday_counts, weekday_means = _weekday_stats(
+            _weekdays(df['date'].to_numpy(dtype='datetime64[ns]')), df['outgoing'].to_numpy(dtype=np.float64))
         weekdays = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
 
-        for i in range(7):
-            if weekday_spending[i]:
-                weekday_stats[weekdays[i]] = {
-                    'mean': np.mean(weekday_spending[i]),
-                    'median': np.median(weekday_spending[i]),
-                    'total': sum(weekday_spending[i]),
-                    'count': len(weekday_spending[i])
-                }
-            else:
-                weekday_stats[weekdays[i]] = {'mean': 0, 'median': 0, 'total': 0, 'count': 0}
-
         # Create visualization
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
+        fig, ((ax1, ax2), (ax3, ax4)) = _reuse_figure('weekday_analysis', 2, 2, figsize=(15, 10))
 
         # Average spending by weekday
-        avg_spending = [weekday_stats[day]['mean'] for day in weekdays]
+        avg_spending = weekday_means.tolist()
         colors = ['lightblue' if i < 5 else 'lightcoral' for i in range(7)]
 
         ax1.bar(weekdays, avg_spending, color=colors)
@@ -343,14 +590,14 @@ def plot_day_of_week_analysis(transactions, output_path='cache/chart_cache/weekd
         ax1.tick_params(axis='x', rotation=45)
 
         # Total spending by weekday
-        total_spending = [weekday_stats[day]['total'] for day in weekdays]
+        total_spending = weekday_totals.tolist()
         ax2.bar(weekdays, total_spending, color=colors)
         ax2.set_title('Total Spending by Day of Week')
         ax2.set_ylabel('Total Amount (IDR)')
         ax2.tick_params(axis='x', rotation=45)
 
         # Transaction count by weekday
-        transaction_counts = [weekday_stats[day]['count'] for day in weekdays]
+        transaction_counts = weekday_counts.tolist()
         ax3.bar(weekdays, transaction_counts, color=colors)
         ax3.set_title('Number of Transactions by Day of Week')
         ax3.set_ylabel('Transaction Count')
@@ -370,74 +617,62 @@ def plot_day_of_week_analysis(transactions, output_path='cache/chart_cache/weekd
             ax4.text(0.5, 0.5, 'No spending data', ha='center', va='center', transform=ax4.transAxes)
             ax4.set_title('Weekday vs Weekend Spending')
 
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        _save_chart(fig, output_path, key=key)
 
     except Exception as e:
         print(f"Error generating weekday analysis: {e}")
         _create_fallback_chart(output_path, "Weekday Analysis", f"Error: {str(e)}")
 
 
+def _velocity_stats(spending):
+    """Get the average daily spending of the last 7 days and of the 7 days before them."""
+    return spending[-7:].mean(), spending[-14:-7].mean()
+
+
 def plot_spending_velocity(transactions, output_path='cache/chart_cache/spending_velocity.png'):
     """Show spending velocity and predict future balance."""
-    if not transactions:
+    if _has_too_few(transactions, 'spending_velocity'):
+        _create_fallback_chart(output_path, "Spending Velocity", _too_few_message('spending_velocity'))
+        return
+
+    df = transactions_to_frame(transactions)
+    if df.empty:
         _create_fallback_chart(output_path, "Spending Velocity", "No transaction data available")
         return
 
-    try:
-        # Sort transactions by date
-        sorted_transactions = sorted(transactions, key=lambda x: x.date if hasattr(x, 'date') else x['date'])
+    key = _chart_key(df, 'spending_velocity')
+    if _is_rendered(output_path, key):
+        return
 
+    try:
         # Aggregate by date to handle multiple transactions per day
-        daily_data = defaultdict(lambda: {'balance': 0, 'spending': 0, 'date': None})
-
-        for t in sorted_transactions:
-            date = t.date if hasattr(t, 'date') else t['date']
-            if isinstance(date, str):
-                date = datetime.strptime(date, '%Y-%m-%d')
+        aggregates = _daily_aggregates(df)
+        ordered = _sorted_by_date(df)
+        # Use the latest transaction of each day for its date and balance
+        last_of_day = ordered.loc[~ordered['date'].dt.normalize().duplicated(keep='last'), ['date', 'balance']]
+        spending_by_day = aggregates.daily_spending
 
-            date_key = date.date()
-            balance = t.balance if hasattr(t, 'balance') else t['balance']
-            outgoing = abs(t.outgoing or 0) if hasattr(t, 'outgoing') else abs(t['outgoing'] or 0)
-
-            daily_data[date_key]['balance'] = balance  # Use latest balance for the day
-            daily_data[date_key]['spending'] += outgoing  # Sum spending for the day
-            daily_data[date_key]['date'] = date
-
-        if len(daily_data) < 2:
+        if len(spending_by_day) < 2:
             _create_fallback_chart(output_path, "Spending Velocity", "Insufficient data for velocity analysis")
             return
 
-        # Convert to lists
-        dates = []
-        balances = []
-        daily_spending = []
-
-        for date_key in sorted(daily_data.keys()):
-            data = daily_data[date_key]
-            dates.append(data['date'])
-            balances.append(data['balance'])
-            daily_spending.append(data['spending'])
-
-        # Create DataFrame
         df = pd.DataFrame({
-            'date': dates,
-            'balance': balances,
-            'spending': daily_spending
+            'date': last_of_day['date'].values,
+            'balance': last_of_day['balance'].values,
+            'spending': spending_by_day.values
         })
 
         # Calculate moving average spending
         if len(df) >= 7:
-            df['spending_7day_avg'] = df['spending'].rolling(window=7, min_periods=1).mean()
+            df['spending_7day_avg'] = aggregates.ma7.values
         else:
             df['spending_7day_avg'] = df['spending']
 
         # Create plot
-        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 12))
+        fig, (ax1, ax2, ax3) = _reuse_figure('spending_velocity', 3, 1, figsize=(12, 12))
 
         # Balance over time
-        ax1.plot(df['date'], df['balance'], color='blue', linewidth=2, label='Account Balance')
+        _plot_series(ax1, df['date'], df['balance'], color='blue', linewidth=2, label='Account Balance')
         ax1.set_title('Account Balance Over Time')
         ax1.set_ylabel('Balance (IDR)')
         ax1.grid(True, alpha=0.3)
@@ -445,7 +680,7 @@ def plot_spending_velocity(transactions, output_path='cache/chart_cache/spending
 
         # Daily spending with moving average
         ax2.bar(df['date'], df['spending'], alpha=0.6, label='Daily Spending', color='red')
-        ax2.plot(df['date'], df['spending_7day_avg'], color='darkred', linewidth=2, label='7-Day Average')
+        _plot_series(ax2, df['date'], df['spending_7day_avg'], color='darkred', linewidth=2, label='7-Day Average')
         ax2.set_title('Daily Spending Pattern')
         ax2.set_ylabel('Spending (IDR)')
         ax2.grid(True, alpha=0.3)
@@ -454,8 +689,7 @@ def plot_spending_velocity(transactions, output_path='cache/chart_cache/spending
         # Spending trend analysis
         if len(df) >= 14:
             # Calculate recent vs previous spending rate
-            recent_avg = df['spending'].tail(7).mean()
-            previous_avg = df['spending'].iloc[-14:-7].mean() if len(df) >= 14 else df['spending'].head(7).mean()
+            recent_avg, previous_avg = _velocity_stats(df['spending'].to_numpy(dtype=np.float64))
 
             trend_pct = ((recent_avg - previous_avg) / previous_avg * 100) if previous_avg > 0 else 0
 
@@ -478,91 +712,37 @@ def plot_spending_velocity(transactions, output_path='cache/chart_cache/spending
                      ha='center', va='center', transform=ax3.transAxes)
             ax3.set_title('Spending Velocity Comparison')
 
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        _save_chart(fig, output_path, key=key)
 
     except Exception as e:
         print(f"Error generating spending velocity: {e}")
         _create_fallback_chart(output_path, "Spending Velocity", f"Error: {str(e)}")
 
 
-def plot_budget_progress(transactions, budget_limits, output_path='cache/chart_cache/budget_progress.png'):
-    """Show budget progress with visual indicators."""
-    if not transactions or not budget_limits:
-        _create_fallback_chart(output_path, "Budget Progress", "No budget or transaction data available")
-        return
-
-    try:
-        # Calculate current month spending by category
-        current_month = datetime.now().replace(day=1)
-        current_month_transactions = [
-            t for t in transactions
-            if (t.date if hasattr(t, 'date') else t['date']) >= current_month
-        ]
-
-        category_spending = defaultdict(float)
-        for t in current_month_transactions:
-            outgoing = abs(t.outgoing or 0) if hasattr(t, 'outgoing') else abs(t['outgoing'] or 0)
-            category = "Unknown"
-            if hasattr(t, 'category') and t.category:
-                category = t.category.name if hasattr(t.category, 'name') else str(t.category)
-            category_spending[category] += outgoing
-
-        # Create budget progress visualization
-        categories = list(budget_limits.keys())
-        spent_amounts = [category_spending.get(cat, 0) for cat in categories]
-        budget_amounts = [budget_limits[cat] for cat in categories]
-        progress_pcts = [min(spent / budget * 100, 100) if budget > 0 else 0
-                         for spent, budget in zip(spent_amounts, budget_amounts)]
-
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
-
-        # Progress bars
-        colors = ['red' if pct >= 100 else 'orange' if pct >= 80 else 'green' for pct in progress_pcts]
-        bars = ax1.barh(categories, progress_pcts, color=colors)
-
-        ax1.set_title('Budget Progress (% of Budget Used)')
-        ax1.set_xlabel('Percentage (%)')
-        ax1.set_xlim(0, 120)
+def _has_too_few(transactions, chart):
+    """Whether a non-empty input is too small for the chart, checked before building a frame."""
+    return 0 < len(transactions) < MIN_PLOT_N[chart]
 
-        # Add percentage labels
-        for bar, pct in zip(bars, progress_pcts):
-            ax1.text(bar.get_width() + 1, bar.get_y() + bar.get_height() / 2,
-                     f'{pct:.1f}%', va='center')
-
-        # Add budget limit line
-        ax1.axvline(x=100, color='red', linestyle='--', alpha=0.7, label='Budget Limit')
-        ax1.legend()
 
-        # Spending vs Budget comparison
-        x = np.arange(len(categories))
-        width = 0.35
-
-        ax2.bar(x - width / 2, spent_amounts, width, label='Spent', color='lightcoral')
-        ax2.bar(x + width / 2, budget_amounts, width, label='Budget', color='lightblue')
-
-        ax2.set_title('Spending vs Budget Amounts')
-        ax2.set_ylabel('Amount (IDR)')
-        ax2.set_xticks(x)
-        ax2.set_xticklabels(categories, rotation=45, ha='right')
-        ax2.legend()
-
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-
-    except Exception as e:
-        print(f"Error generating budget progress: {e}")
-        _create_fallback_chart(output_path, "Budget Progress", f"Error: {str(e)}")
+def _too_few_message(chart):
+    """Fallback text for an input below the chart's MIN_PLOT_N."""
+    return f"At least {MIN_PLOT_N[chart]} transactions are needed for this chart"
 
 
 def _create_fallback_chart(output_path, title, message):
     """Create a simple fallback chart when data is insufficient or errors occur."""
     try:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        # The fallback replaces whatever chart the key file described
+        if os.path.exists(output_path + '.key'):
+            os.remove(output_path + '.key')
+
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
 
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig = Figure(figsize=(6, 4))
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
         ax.text(0.5, 0.5, message, ha='center', va='center', fontsize=14,
                 transform=ax.transAxes, wrap=True)
         ax.set_title(title, fontsize=16)
@@ -570,9 +750,8 @@ def _create_fallback_chart(output_path, title, message):
         ax.set_ylim(0, 1)
         ax.axis('off')
 
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(output_path, dpi=FALLBACK_DPI, bbox_inches='tight', pil_kwargs=PNG_OPTIONS)
     except Exception as e:
         print(f"Error creating fallback chart: {e}")
 
@@ -586,39 +765,34 @@ def plot_budget_progress(transactions, budget_limits, output_path='cache/chart_c
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
     try:
+        df = transactions_to_frame(transactions)
+
         # Get current month data
         current_month = datetime.now().replace(day=1)
         
-        # Calculate spending by category for current month
-        category_spending = defaultdict(float)
-        
-        for t in transactions:
-            date = t.date if hasattr(t, 'date') else t['date']
-            if isinstance(date, str):
-                date = datetime.strptime(date, '%Y-%m-%d')
-            
-            # Only include current month transactions
-            if date.year == current_month.year and date.month == current_month.month:
-                outgoing = abs(t.outgoing or 0) if hasattr(t, 'outgoing') else abs(t['outgoing'] or 0)
-                
-                # Get category
-                category = "Uncategorized"
-                if hasattr(t, 'category') and t.category:
-                    category = t.category.name if hasattr(t.category, 'name') else str(t.category)
-                
-                category_spending[category] += outgoing
-        
+        key = _chart_key(df, 'budget_progress', list(budget_limits.items()), current_month.strftime('%Y-%m'))
+        if _is_rendered(output_path, key):
+            return
+
         # Prepare data for plotting
         categories = list(budget_limits.keys())
-        budgets = [budget_limits[cat] for cat in categories]
-        spent = [category_spending.get(cat, 0) for cat in categories]
         
         if not categories:
             _create_fallback_chart(output_path, "Budget Progress", "No budget categories found")
             return
         
+        # Calculate spending by category for current month
+        month_start = pd.Timestamp(current_month.date())
+        month_df = df[(df['date'] >= month_start) & (df['date'] < month_start + pd.offsets.MonthBegin(1))]
+        monthly = _extract_monthly_category_df(
+            month_df, month_df['category'].where(month_df['category'].astype(bool), "Uncategorized"))
+        spent = (monthly.groupby('category')['outgoing'].sum()
+                 .reindex(categories, fill_value=0).to_numpy(dtype=np.float64))
+        budgets = np.fromiter((budget_limits[cat] for cat in categories), dtype=np.float64, count=len(categories))
+        percentages = np.divide(spent * 100, budgets, out=np.zeros(len(categories)), where=budgets > 0)
+        
         # Create horizontal bar chart
-        fig, ax = plt.subplots(figsize=(12, 8))
+        fig, ax = _reuse_figure('budget_progress', figsize=(12, 8))
         
         y_pos = np.arange(len(categories))
         
@@ -636,19 +810,17 @@ def plot_budget_progress(transactions, budget_limits, output_path='cache/chart_c
         ax.grid(axis='x', alpha=0.3)
         
         # Add percentage labels
-        for i, (budget, spending) in enumerate(zip(budgets, spent)):
-            percentage = (spending / budget * 100) if budget > 0 else 0
+        for i, (budget, spending, percentage) in enumerate(zip(budgets, spent, percentages)):
             color = 'red' if percentage > 100 else 'orange' if percentage > 80 else 'green'
             ax.text(max(budget, spending) + budget * 0.02, i, f'{percentage:.1f}%', 
                    va='center', color=color, fontweight='bold')
         
         # Format x-axis to show values in millions if large
-        if max(budgets + spent) > 1000000:
-            ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x/1000000:.1f}M'))
+        if max(budgets.max(), spent.max()) > 1000000:
+            from matplotlib.ticker import FuncFormatter
+            ax.xaxis.set_major_formatter(FuncFormatter(lambda x, p: f'{x/1000000:.1f}M'))
         
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        _save_chart(fig, output_path, dpi=TEXT_CHART_DPI, key=key)
 
     except Exception as e:
         print(f"Error generating budget progress chart: {e}")
@@ -657,59 +829,142 @@ def plot_budget_progress(transactions, budget_limits, output_path='cache/chart_c
 
 def plot_spending_heatmap(transactions, output_path='cache/chart_cache/spending_heatmap.png'):
     """Create a calendar heatmap of spending intensity."""
-    if not transactions:
+    if _has_too_few(transactions, 'spending_heatmap'):
+        _create_fallback_chart(output_path, "Spending Heatmap", _too_few_message('spending_heatmap'))
+        return
+
+    df = transactions_to_frame(transactions)
+    if df.empty:
         _create_fallback_chart(output_path, "Spending Heatmap", "No transaction data available")
         return
     
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
+    key = _chart_key(df, 'spending_heatmap')
+    if _is_rendered(output_path, key):
+        return
+
     try:
-        # Group spending by date
-        daily_spending = defaultdict(float)
-        
-        for t in transactions:
-            date = t.date if hasattr(t, 'date') else t['date']
-            if isinstance(date, str):
-                date = datetime.strptime(date, '%Y-%m-%d').date()
-            elif hasattr(date, 'date'):
-                date = date.date()
-            
-            outgoing = abs(t.outgoing or 0) if hasattr(t, 'outgoing') else abs(t['outgoing'] or 0)
-            daily_spending[date] += outgoing
+        # Spending per day, shared with the other charts drawn from this frame
+        daily_spending = _daily_aggregates(df).daily_spending
         
-        if not daily_spending:
+        if daily_spending.empty:
             _create_fallback_chart(output_path, "Spending Heatmap", "No spending data found")
             return
         
-        # Convert to DataFrame for easier manipulation
-        dates = list(daily_spending.keys())
-        amounts = list(daily_spending.values())
-        
-        df = pd.DataFrame({
-            'date': dates,
-            'amount': amounts
-        })
-        
         # Create calendar-style heatmap
-        fig, ax = plt.subplots(figsize=(14, 8))
-        
-        # Group by month and create heatmap-like visualization
-        df['year_month'] = df['date'].apply(lambda x: x.strftime('%Y-%m'))
-        df['day'] = df['date'].apply(lambda x: x.day)
-        
-        # Pivot for heatmap
-        heatmap_data = df.pivot_table(values='amount', index='year_month', columns='day', fill_value=0)
+        fig, ax = _reuse_figure('spending_heatmap', figsize=(14, 8))
         
-        # Create heatmap
-        sns.heatmap(heatmap_data, cmap='Reds', cbar_kws={'label': 'Spending (IDR)'}, ax=ax)
+        # Scatter each day's total into a month x day-of-month grid in one assignment
+        dates = daily_spending.index.to_numpy(dtype='datetime64[ns]')
+        months, month_rows = np.unique(np.datetime_as_string(dates, unit='M'), return_inverse=True)
+        days, day_columns = np.unique(daily_spending.index.day, return_inverse=True)
+        grid = np.zeros((len(months), len(days)))
+        grid[month_rows, day_columns] = daily_spending.values
+
+        # Draw the grid as one mesh, months from the top down, with a label on every cell row and column
+        mesh = ax.pcolormesh(grid, cmap='Reds')
+        fig.colorbar(mesh, ax=ax, label='Spending (IDR)').outline.set_visible(False)
+        ax.set_xticks(np.arange(len(days)) + 0.5, labels=days)
+        ax.set_yticks(np.arange(len(months)) + 0.5, labels=months)
+        ax.invert_yaxis()
+        ax.tick_params(length=0)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
         ax.set_title('Daily Spending Intensity Heatmap')
         ax.set_xlabel('Day of Month')
         ax.set_ylabel('Month')
         
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        _save_chart(fig, output_path, dpi=TEXT_CHART_DPI, key=key)
 
     except Exception as e:
         print(f"Error generating spending heatmap: {e}")
-        _create_fallback_chart(output_path, "Spending Heatmap", f"Error: {str(e)}")
\ No newline at end of file
+        _create_fallback_chart(output_path, "Spending Heatmap", f"Error: {str(e)}")
+
+
+# Chart name -> draws that chart of a prepared frame into a path, given the budget limits
+REPORT_CHARTS = {
+    'monthly_trends': lambda df, path, budget_limits: plot_spending_trends(df, path, 'monthly'),
+    'daily_trends': lambda df, path, budget_limits: plot_spending_trends(df, path, 'daily'),
+    'category_trends': lambda df, path, budget_limits: plot_category_trends(df, path),
+    'weekday_analysis': lambda df, path, budget_limits: plot_day_of_week_analysis(df, path),
+    'spending_heatmap': lambda df, path, budget_limits: plot_spending_heatmap(df, path),
+    'spending_velocity': lambda df, path, budget_limits: plot_spending_velocity(df, path),
+    'budget_progress': lambda df, path, budget_limits: plot_budget_progress(df, budget_limits, path),
+}
+
+# The frame a render_report worker process draws every chart from
+_report_frame = None
+
+
+def render_all(transactions, output_dir, budget_limits=None):
+    """
+    Render every advanced chart of a set of transactions into output_dir, several at once.
+
+    The transactions are parsed into one frame up front, and everything derived from it (its
+    fingerprint, the daily aggregates) is computed once for all charts. Each chart draws on its
+    own per-thread figure, so they can run side by side: the NumPy aggregation and PNG writing
+    of one chart overlap with the drawing of another. The budget progress chart is only
+    rendered when budget limits are given.
+
+    Returns:
+        Dict of chart name -> path of its PNG file
+    """
+    df = transactions_to_frame(transactions)
+    names = _report_chart_names(budget_limits)
+    paths = _report_chart_paths(output_dir, names)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(REPORT_CHARTS[name], df, paths[name], budget_limits) for name in names]
+    for future in futures:
+        future.result()
+    return paths
+
+
+def render_report(transactions, budget_limits, output_dir):
+    """
+    Render every advanced chart of a set of transactions into output_dir, one process per core.
+
+    Drawing and rasterizing hold the GIL, so unlike render_all this scales with the number of
+    cores. The frame and its resolved categories are sent to each worker once, when it starts,
+    so the workers never touch the database. Worth it for full reports on multi-core hosts;
+    render_all is cheaper for a single chart set on a small machine.
+
+    Returns:
+        Dict of chart name -> path of its PNG file
+    """
+    df = transactions_to_frame(transactions)
+    names = _report_chart_names(budget_limits)
+    paths = _report_chart_paths(output_dir, names)
+    categories = _derived(df, 'categories', _resolve_categories) if not df.empty else None
+
+    with ProcessPoolExecutor(max_workers=min(len(names), os.cpu_count() or 1),
+                             initializer=_init_report_worker, initargs=(df, categories)) as pool:
+        futures = [pool.submit(_render_report_chart, name, paths[name], budget_limits) for name in names]
+    for future in futures:
+        future.result()
+    return paths
+
+
+def _report_chart_names(budget_limits):
+    """Names of the charts in a report; the budget progress chart needs budget limits."""
+    return [name for name in REPORT_CHARTS if budget_limits or name != 'budget_progress']
+
+
+def _report_chart_paths(output_dir, names):
+    """Create output_dir and name the PNG file of each chart in it."""
+    os.makedirs(output_dir, exist_ok=True)
+    return {name: os.path.join(output_dir, f'{name}.png') for name in names}
+
+
+def _init_report_worker(df, categories):
+    """Keep the report frame in a worker process, with the categories resolved by the parent."""
+    global _report_frame
+    _report_frame = df
+    if categories is not None:
+        _derived(df, 'categories', lambda _: categories)
+
+
+def _render_report_chart(name, output_path, budget_limits):
+    """Draw one chart of the worker's report frame."""
+    REPORT_CHARTS[name](_report_frame, output_path, budget_limits)
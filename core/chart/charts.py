@@ -1,4 +1,10 @@
 import os
+
+import matplotlib
+
+# Charts are only ever written to PNG files
+matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
 
 
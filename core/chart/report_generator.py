@@ -1,74 +1,157 @@
+import hashlib
+import operator
 import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 from core.chart.visuals import (
+    ChartData,
+    WRITE_BUFFER_SIZE,
+    extract_chart_data,
     plot_balance_over_time,
     plot_incoming_vs_outgoing,
     plot_total_incoming_outgoing
 )
 
-def generate_all_charts(transactions: list[dict], user_id: int, is_all_trx: bool = False) -> None:
-    """Generates individual charts and saves them to disk."""
-    folder = "cache/chart_cache"
-    os.makedirs(folder, exist_ok=True)
+# Order of the tuples handed to the plot functions, which read them by position
+CHART_FIELDS = ('date', 'incoming', 'outgoing', 'balance')
+# The combined report is kept and sent to Telegram, so unlike its charts it is compressed
+REPORT_PNG_OPTIONS = {'optimize': False, 'compress_level': 6}
+REPORT_FOLDER = "cache/chart_cache"
+# Finished reports kept under the hash of their transactions, newest REPORT_CACHE_SIZE by mtime
+REPORT_CACHE_FOLDER = f"{REPORT_FOLDER}/reports"
+REPORT_CACHE_SIZE = 64
 
-    if is_all_trx:
-        plot_balance_over_time_path = f"{folder}/{user_id}_balance_all_time.png"
-        plot_incoming_vs_outgoing_path = f"{folder}/{user_id}_bar_all_time.png"
-        plot_total_incoming_outgoing_path = f"{folder}/{user_id}_pie_all_time.png"
-    else:
-        plot_balance_over_time_path = f"{folder}/{user_id}_balance.png"
-        plot_incoming_vs_outgoing_path = f"{folder}/{user_id}_bar.png"
-        plot_total_incoming_outgoing_path = f"{folder}/{user_id}_pie.png"
-
-    plot_balance_over_time(transactions, plot_balance_over_time_path, all_time=is_all_trx)
-    plot_incoming_vs_outgoing(transactions, plot_incoming_vs_outgoing_path, all_time=is_all_trx)
-    plot_total_incoming_outgoing(transactions, plot_total_incoming_outgoing_path, all_time=is_all_trx)
-
-def combine_charts(user_id: int, period: str = "", is_all_trx: bool = False) -> str:
-    """Combines individual charts into a single report image with an optional period label."""
-    folder = "cache/chart_cache"
-    if is_all_trx:
-        period = "All Time"
-        image_path = f"{folder}/{user_id}_report_all_time.png"
-        files = [
-            f"{folder}/{user_id}_balance_all_time.png",
-            f"{folder}/{user_id}_bar_all_time.png",
-            f"{folder}/{user_id}_pie_all_time.png"
-        ]
-    else:
-        image_path = f"{folder}/{user_id}_report.png"
-        files = [
-            f"{folder}/{user_id}_balance.png",
-            f"{folder}/{user_id}_bar.png",
-            f"{folder}/{user_id}_pie.png"
-        ]
-
-    images = [Image.open(f) for f in files if os.path.exists(f)]
-    if not images:
-        raise FileNotFoundError("No chart images found to combine.")
-
-    width = min(img.width for img in images)
-    resized = [img.resize((width, int(img.height * (width / img.width)))) for img in images]
-
-    # Font setup for the period text
+# Chart worker processes, one per chart, started on the first report and shared by later ones
+CHART_WORKERS = 3
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _report_suffix(is_all_trx: bool) -> str:
+    """File name suffix that keeps all-time reports apart from period reports."""
+    return "_all_time" if is_all_trx else ""
+
+
+@lru_cache(maxsize=None)
+def _period_font():
+    """Load the font of the report's period text once, on the first report that has a period."""
     try:
-        font = ImageFont.truetype("arial.ttf", 28)
+        return ImageFont.truetype("arial.ttf", 28)
     except IOError:
-        font = ImageFont.load_default()
+        return ImageFont.load_default()
 
-    title_height = 40 if period else 0
-    total_height = sum(img.height for img in resized) + title_height
-    combined_img = Image.new('RGB', (width, total_height), (255, 255, 255))
 
-    draw = ImageDraw.Draw(combined_img)
-    if period:
-        draw.text((10, 10), f"Period: {period}", fill="black", font=font)
+def _get_pool() -> ProcessPoolExecutor:
+    """Get the chart worker pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=CHART_WORKERS)
+        return _pool
+
+
+def _warm_worker() -> None:
+    """No-op job; unpickling it imports this module, and with it matplotlib, in the worker."""
+
+
+def start_chart_workers() -> None:
+    """
+    Start the chart worker processes at bot startup.
+
+    The workers live for the whole bot lifetime, so starting them and importing matplotlib
+    up front keeps that cost out of the first report a user asks for.
+    """
+    pool = _get_pool()
+    for future in [pool.submit(_warm_worker) for _ in range(CHART_WORKERS)]:
+        future.result()
+
+
+def _chart_inputs(transactions, all_time: bool) -> ChartData:
+    """
+    Extract the chart columns once, in this process, for all three plots.
 
-    y = title_height
-    for img in resized:
-        combined_img.paste(img, (0, y))
-        y += img.height
+    All-time charts are given ORM objects or rows, read by attribute, and the others dicts, read by
+    key. The fields are first copied into plain tuples in CHART_FIELDS order, which also drains a
+    streamed result, and the workers are then sent NumPy arrays instead of the records.
+    """
+    get = operator.attrgetter(*CHART_FIELDS) if all_time else operator.itemgetter(*CHART_FIELDS)
+    return extract_chart_data([get(t) for t in transactions], all_time)
 
-    combined_img.save(image_path)
+
+def _chart_digest(data: ChartData, period: str | None) -> str:
+    """Hash the chart columns together with the period printed on the report."""
+    # The period comes straight from a statement cell, which can be empty
+    digest = hashlib.blake2b(str(period or "").encode(), digest_size=8)
+    for column in (data.dates.view(np.int64), data.incoming, data.outgoing, data.balances):
+        digest.update(np.ascontiguousarray(column))
+    return digest.hexdigest()
+
+
+def _sweep_report_cache() -> None:
+    """Delete the least recently used cached reports beyond REPORT_CACHE_SIZE."""
+    entries = sorted(os.scandir(REPORT_CACHE_FOLDER), key=lambda e: e.stat().st_mtime_ns, reverse=True)
+    for entry in entries[REPORT_CACHE_SIZE:]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+def generate_report(transactions, user_id: int, period: str = "", is_all_trx: bool = False) -> str:
+    """
+    Generates the charts and the combined report, reusing a stored report for the same transactions.
+
+    Reports are stored under a hash of the charted fields, so asking again without new or changed
+    transactions copies the stored report into place instead of drawing and combining the charts.
+
+    Returns:
+        Path of the combined report
+    """
+    if is_all_trx:
+        period = "All Time"
+    data = _chart_inputs(transactions, is_all_trx)
+    suffix = _report_suffix(is_all_trx)
+    image_path = f"{REPORT_FOLDER}/{user_id}_report{suffix}.png"
+    cached_path = f"{REPORT_CACHE_FOLDER}/{user_id}_{_chart_digest(data, period)}_report{suffix}.png"
+
+    if os.path.exists(cached_path):
+        # Touch the hit so the sweep treats it as recently used
+        os.utime(cached_path)
+        shutil.copyfile(cached_path, image_path)
+        return image_path
+
+    # The three charts are drawn side by side in the workers, since matplotlib's drawing holds the
+    # GIL, and come back as pixels, so they are never written out and read back
+    os.makedirs(REPORT_FOLDER, exist_ok=True)
+    pool = _get_pool()
+    futures = [pool.submit(plot, data, None, all_time=is_all_trx)
+               for plot in (plot_balance_over_time, plot_incoming_vs_outgoing, plot_total_incoming_outgoing)]
+    combine_charts([future.result() for future in futures], period, image_path)
+    os.makedirs(REPORT_CACHE_FOLDER, exist_ok=True)
+    shutil.copyfile(image_path, cached_path)
+    _sweep_report_cache()
     return image_path
+
+
+def combine_charts(strips: list, period: str, image_path: str) -> None:
+    """
+    Combines the rendered charts into a single report image with an optional period label.
+
+    The charts come in as equally wide RGB pixel arrays straight from the workers, so none of them
+    is written to disk and decoded again.
+    """
+    # Stack the pixel rows in one copy instead of pasting chart by chart into a canvas
+    if period:
+        title = Image.new('RGB', (strips[0].shape[1], 40), (255, 255, 255))
+        ImageDraw.Draw(title).text((10, 10), f"Period: {period}", fill="black", font=_period_font())
+        strips = [np.asarray(title), *strips]
+    combined_img = Image.fromarray(np.concatenate(strips, axis=0))
+
+    with open(image_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        combined_img.save(f, 'PNG', **REPORT_PNG_OPTIONS)
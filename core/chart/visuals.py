@@ -1,63 +1,205 @@
-import matplotlib.pyplot as plt
+import dataclasses
+import math
+import operator
+import threading
+from functools import lru_cache
 
-def plot_balance_over_time(transactions, output_path='cache/chart_cache/balance_over_time.png', all_time=False):
-    """Plot balance over time."""
-    if all_time:
-        dates = [t.date for t in transactions if t.date]
-        balances = [t.balance for t in transactions]
-    else:
-        dates = [t['date'] for t in transactions]
-        balances = [t['balance'] for t in transactions]
+import matplotlib
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
 
-    plt.figure(figsize=(10, 6))
-    plt.plot(dates, balances, marker='o', linestyle='-', color='royalblue')
-    plt.title("Balance Over Time")
-    plt.xlabel("Date")
-    plt.ylabel("Balance")
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
+# Charts are only ever written to PNG files, including from background tasks without a display
+matplotlib.use('Agg')
 
+from matplotlib import font_manager
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
-def plot_incoming_vs_outgoing(transactions, output_path='cache/chart_cache/incoming_outgoing.png', all_time=False):
-    """Plot incoming vs outgoing transactions."""
-    if all_time:
-        dates = [t.date for t in transactions if t.date]
-        incoming = [t.incoming or 0 for t in transactions]
-        outgoing = [t.outgoing or 0 for t in transactions]
+# The report stacks the charts at one shared width, so each is rendered at that width
+# directly instead of being rendered larger and shrunk by combine_charts
+CHART_WIDTH_PX = 600
+# Charts saved to a file are written through a 256 KiB buffer in a few large writes, and left
+# uncompressed since they are only working copies; the report itself is compressed
+WRITE_BUFFER_SIZE = 1 << 18
+PNG_OPTIONS = {'optimize': False, 'compress_level': 0}
+
+# Per-thread chart name -> (figure, axes); recap charts are drawn from executor threads
+_figures = threading.local()
+
+
+def _get_axes(name, figsize, margins=None):
+    """
+    Get this thread's figure and cleared axes for a chart, created on its first render.
+
+    The margins are fixed once, when the figure is created, instead of a tight_layout pass
+    on every render.
+    """
+    cache = getattr(_figures, 'cache', None)
+    if cache is None:
+        cache = _figures.cache = {}
+
+    entry = cache.get(name)
+    if entry is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        if margins:
+            fig.subplots_adjust(**margins)
+        entry = cache[name] = (fig, fig.subplots())
     else:
-        dates = [t['date'].strftime('%Y-%m-%d') for t in transactions]
-        incoming = [t['incoming'] or 0 for t in transactions]
-        outgoing = [t['outgoing'] or 0 for t in transactions]
-
-    plt.figure(figsize=(12, 6))
-    plt.bar(dates, incoming, label='Incoming', color='green')
-    plt.bar(dates, outgoing, bottom=incoming, label='Outgoing', color='red')  # stacked
-    plt.xticks(rotation=45, ha='right')
-    plt.title("Incoming vs Outgoing")
-    plt.xlabel("Date")
-    plt.ylabel("Amount")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
-
-def plot_total_incoming_outgoing(transactions, output_path='cache/chart_cache/pie_io.png', all_time=False):
-    """Plot total incoming vs outgoing transactions."""
-    if all_time:
-        total_incoming = sum(t.incoming or 0 for t in transactions)
-        total_outgoing = sum(t.outgoing or 0 for t in transactions)
+        entry[1].clear()
+    return entry
+
+
+def _save(fig, output_path):
+    """Write a chart at CHART_WIDTH_PX pixels wide."""
+    with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        fig.savefig(f, format='png', dpi=CHART_WIDTH_PX / fig.get_figwidth(), pil_kwargs=PNG_OPTIONS)
+
+
+def _render(fig):
+    """Draw a chart at CHART_WIDTH_PX pixels wide and return its RGB pixels, without a PNG round trip."""
+    fig.set_dpi(CHART_WIDTH_PX / fig.get_figwidth())
+    fig.canvas.draw()
+    # The buffer is reused by the next draw of this figure, so the pixels are copied out; only the
+    # RGB channels are copied, which also leaves combine_charts no alpha channel to convert away
+    return np.ascontiguousarray(np.asarray(fig.canvas.buffer_rgba())[..., :3])
+
+
+def _finish(fig, output_path):
+    """Write the chart to output_path, or return its pixels when output_path is None."""
+    if output_path is None:
+        return _render(fig)
+    _save(fig, output_path)
+
+
+@lru_cache(maxsize=None)
+def _font(size):
+    """Load matplotlib's default font at a pixel size, so drawn charts match the plotted ones."""
+    return ImageFont.truetype(font_manager.findfont(font_manager.FontProperties()), size)
+
+
+def _draw_pie(labels, values, colors, title, output_path, startangle=140):
+    """
+    Draw a square pie chart CHART_WIDTH_PX wide straight onto a PIL image, without a matplotlib figure.
+
+    Slices run counterclockwise from startangle, like matplotlib's pie. The image is drawn at twice
+    the size and halved, which smooths the wedge edges that ImageDraw does not anti-alias.
+    """
+    scale = 2
+    size = CHART_WIDTH_PX * scale
+    img = Image.new('RGB', (size, size), 'white')
+    draw = ImageDraw.Draw(img)
+    # Same placement as matplotlib's pie in a 6x6 inch figure
+    cx, cy, r = size * 0.513, size * 0.505, size * 0.308
+    label_font, title_font = _font(14 * scale), _font(17 * scale)
+
+    total = sum(values)
+    angle = startangle
+    for label, value, color in zip(labels, values, colors):
+        share = value / total if total else 0
+        end = angle + share * 360
+        if share:
+            # ImageDraw angles run clockwise, matplotlib's counterclockwise
+            draw.pieslice((cx - r, cy - r, cx + r, cy + r), -end, -angle, fill=color)
+        mid = math.radians((angle + end) / 2)
+        dx, dy = math.cos(mid), -math.sin(mid)
+        draw.text((cx + 1.1 * r * dx, cy + 1.1 * r * dy), label, fill='black', font=label_font,
+                  anchor='lm' if dx >= 0 else 'rm')
+        draw.text((cx + 0.6 * r * dx, cy + 0.6 * r * dy), f"{share * 100:.1f}%", fill='black',
+                  font=label_font, anchor='mm')
+        angle = end
+    draw.text((cx, 58 * scale), title, fill='black', font=title_font, anchor='mm')
+
+    img = img.reduce(scale)
+    if output_path is None:
+        return np.asarray(img)
+    with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        img.save(f, 'PNG', **PNG_OPTIONS)
+
+
+def _to_arrays(transactions, all_time):
+    """
+    Pull the chart columns out of the transactions as NumPy arrays, converting each column once.
+
+    Plain tuples are read by position in (date, incoming, outgoing, balance) order, which is how
+    report_generator hands rows to its workers. Otherwise all-time charts are given ORM objects
+    or rows, read by attribute, and the others dicts, read by key. Transactions without a date
+    are left out, missing amounts become 0 and missing balances NaN.
+
+    Returns:
+        Tuple of (dates as datetime64, incoming, outgoing, balances)
+    """
+    if transactions and isinstance(transactions[0], tuple):
+        date_col, incoming_col, outgoing_col, balance_col = zip(*transactions)
     else:
-        total_incoming = sum(t['incoming'] or 0 for t in transactions)
-        total_outgoing = sum(t['outgoing'] or 0 for t in transactions)
+        get = operator.attrgetter if all_time else operator.itemgetter
+        date_col, incoming_col, outgoing_col, balance_col = (
+            [get(field)(t) for t in transactions] for field in ('date', 'incoming', 'outgoing', 'balance'))
+
+    count = len(transactions)
+    dates = np.array(date_col, dtype='datetime64[us]')
+    incoming = np.fromiter((v or 0 for v in incoming_col), dtype=np.float64, count=count)
+    outgoing = np.fromiter((v or 0 for v in outgoing_col), dtype=np.float64, count=count)
+    balances = np.array(balance_col, dtype=np.float64)
+
+    dated = ~np.isnat(dates)
+    if not dated.all():
+        return dates[dated], incoming[dated], outgoing[dated], balances[dated]
+    return dates, incoming, outgoing, balances
+
+
+@dataclasses.dataclass(frozen=True)
+class ChartData:
+    """Columns shared by the three recap charts, extracted from the transactions once."""
+    dates: np.ndarray
+    incoming: np.ndarray
+    outgoing: np.ndarray
+    balances: np.ndarray
+    total_incoming: float
+    total_outgoing: float
 
+
+def extract_chart_data(transactions, all_time=False) -> ChartData:
+    """Extract the chart columns and totals in one pass for all three plot functions."""
+    dates, incoming, outgoing, balances = _to_arrays(transactions, all_time)
+    return ChartData(dates, incoming, outgoing, balances, float(incoming.sum()), float(outgoing.sum()))
+
+
+def plot_balance_over_time(data: ChartData, output_path='cache/chart_cache/balance_over_time.png', all_time=False):
+    """Plot balance over time."""
+    fig, ax = _get_axes('balance_over_time', (10, 6), dict(left=0.1, right=0.97, bottom=0.1, top=0.92))
+    ax.plot(data.dates, data.balances, marker='o', linestyle='-', color='royalblue')
+    ax.set_title("Balance Over Time")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Balance")
+    ax.grid(True)
+    return _finish(fig, output_path)
+
+
+def plot_incoming_vs_outgoing(data: ChartData, output_path='cache/chart_cache/incoming_outgoing.png', all_time=False):
+    """Plot incoming vs outgoing transactions."""
+    dates, incoming, outgoing = data.dates, data.incoming, data.outgoing
+    if not all_time:
+        # A statement period gets one bar slot per day; the date locator ticks the axis, so
+        # no per-bar label strings are built
+        dates = dates.astype('datetime64[D]')
+
+    fig, ax = _get_axes('incoming_vs_outgoing', (12, 6), dict(left=0.08, right=0.98, bottom=0.22, top=0.92))
+    ax.bar(dates, incoming, width=0.8, label='Incoming', color='green')
+    ax.bar(dates, outgoing, width=0.8, bottom=incoming, label='Outgoing', color='red')  # stacked
+    for label in ax.get_xticklabels():
+        label.set(rotation=45, ha='right')
+    ax.set_title("Incoming vs Outgoing")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Amount")
+    ax.legend()
+    return _finish(fig, output_path)
+
+def plot_total_incoming_outgoing(data: ChartData, output_path='cache/chart_cache/pie_io.png', all_time=False):
+    """Plot total incoming vs outgoing transactions."""
     labels = ['Incoming', 'Outgoing']
-    values = [total_incoming, total_outgoing]
+    values = [data.total_incoming, data.total_outgoing]
     colors = ['green', 'red']
 
-    plt.figure(figsize=(6, 6))
-    plt.pie(values, labels=labels, autopct='%1.1f%%', colors=colors, startangle=140)
-    plt.title("Total Incoming vs Outgoing")
-    plt.savefig(output_path)
-    plt.close()
+    # Two wedges and their labels do not need a matplotlib figure
+    return _draw_pie(labels, values, colors, "Total Incoming vs Outgoing", output_path)
@@ -1,16 +1,32 @@
 import dataclasses
+from contextlib import contextmanager
 from datetime import datetime
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint, Boolean, Text
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint, Boolean, Text, Index
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base
 
 from config.settings import DATABASE_URL
 
 Base = declarative_base()
-engine = create_engine(DATABASE_URL)
+# A statement's transactions fit in one multi-row INSERT page instead of the default 1000 rows
+engine = create_engine(DATABASE_URL, insertmanyvalues_page_size=10000)
 Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@contextmanager
+def session_scope():
+    """ Provide a session that commits on success, rolls back on error and is always closed."""
+    session = Session()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
 class SoftDeleteMixin:
     """ Mixin for soft delete functionality."""
     deleted_at = Column(DateTime, nullable=True)
@@ -63,6 +79,11 @@ class BudgetLimit(SoftDeleteMixin, Base):
 
     account = relationship("BankAccount", back_populates="budget_limits")
 
+    __table_args__ = (
+        # Budgets are looked up by account and category among the ones not deleted
+        Index('ix_budget_limits_user_category_deleted', 'user_id', 'category_name', 'deleted_at'),
+    )
+
 
 @dataclasses.dataclass
 class FinancialGoal(SoftDeleteMixin, Base):
@@ -142,8 +163,31 @@ class BankTransaction(SoftDeleteMixin, Base):
 
     __table_args__ = (
         UniqueConstraint('user_id', 'date', name='uq_user_date'),
+        # Every listing filters on the account and deleted_at, then ranges over or orders by date
+        Index('ix_bank_transactions_user_deleted_date', 'user_id', 'deleted_at', 'date'),
     )
 
+
+class TransactionStats(Base):
+    """Running transaction statistics of an account, updated as statements are imported."""
+    __tablename__ = 'transaction_stats'
+
+    user_id = Column(Integer, ForeignKey('bank_accounts.id', ondelete='CASCADE'), primary_key=True)
+    total_transactions = Column(Integer, nullable=False, default=0)
+    # Sums and counts of the positive amounts; averages are derived from them when read
+    total_outcome = Column(Float, nullable=False, default=0)
+    total_income = Column(Float, nullable=False, default=0)
+    outcome_count = Column(Integer, nullable=False, default=0)
+    income_count = Column(Integer, nullable=False, default=0)
+    highest_outcome = Column(Float, nullable=True)
+    highest_income = Column(Float, nullable=True)
+    # Lowest outcome only counts amounts under 10,000, like the recap always has
+    lowest_outcome = Column(Float, nullable=True)
+    lowest_income = Column(Float, nullable=True)
+    # With total_transactions, the transactions version the totals were last checked against
+    max_transaction_id = Column(Integer, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 @dataclasses.dataclass
 class SpendingPattern(SoftDeleteMixin, Base):
     """Store detected spending patterns for users."""
@@ -14,7 +14,8 @@ class AnomalyDetector:
         self.model: IsolationForest | None = None
         if os.path.exists(self.model_path):
             try:
-                self.model = load(self.model_path)
+                # Memory-map the tree arrays instead of copying them out of the pickle on every load
+                self.model = load(self.model_path, mmap_mode='r')
             except Exception:
                 self.model = None
 
@@ -32,14 +33,17 @@ class AnomalyDetector:
         self.model.fit(X)
 
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-        dump(self.model, self.model_path)
+        # Uncompressed, so load can memory-map it
+        dump(self.model, self.model_path, compress=0, protocol=4)
 
     def predict(self, amounts: List[float]) -> Tuple[np.ndarray, np.ndarray]:
         """Run inference on amounts. Returns predictions and anomaly scores."""
         if not self.model:
             raise ValueError("Model not trained")
 
-        X = np.array(amounts).reshape(-1, 1)
-        preds = self.model.predict(X)
-        scores = self.model.decision_function(X)
+        # The forest works in float32, and predict and decision_function would each walk the trees;
+        # both come from one score_samples pass, the same way sklearn derives them
+        X = np.asarray(amounts, dtype=np.float32).reshape(-1, 1)
+        scores = self.model.score_samples(X) - self.model.offset_
+        preds = np.where(scores < 0, -1, 1)
         return preds, scores
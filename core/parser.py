@@ -1,6 +1,6 @@
 import warnings
-from datetime import datetime
 import io
+from datetime import datetime
 
 import msoffcrypto
 import openpyxl
@@ -8,11 +8,31 @@ from msoffcrypto.exceptions import InvalidKeyError, DecryptionError
 
 warnings.filterwarnings("ignore", category=UserWarning, message="Workbook contains no default style")
 
+# Drops the thousands dots and turns the decimal comma into a point in one translate pass
+_AMOUNT_TABLE = str.maketrans({'.': None, ',': '.'})
+
+# Statement rows are read up to column V, the balance
+STATEMENT_COLUMNS = 22
+
+# English and Indonesian month abbreviations, as statements may use either
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Mei': 5, 'Jun': 6, 'Jul': 7,
+    'Aug': 8, 'Agu': 8, 'Agt': 8, 'Sep': 9, 'Oct': 10, 'Okt': 10, 'Nov': 11, 'Dec': 12, 'Des': 12,
+}
+
+def parse_datetime(date_str, time_str):
+    """Convert a 'DD Mon YYYY' date and an 'HH:MM:SS' time to a datetime without going through strptime."""
+    try:
+        day, month, year = date_str.split()
+        hour, minute, second = time_str.split(':')
+        return datetime(int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second))
+    except (KeyError, ValueError):
+        return datetime.strptime(f"{date_str} {time_str}", '%d %b %Y %H:%M:%S')
+
 def parse_amount(amt):
     """Convert an Indonesian currency format (e.g., '3.246.470,00') to float."""
-    if not amt or amt.strip() == '':
-        return 0.0
-    return float(amt.replace('.', '').replace(',', '.'))
+    amt = amt.strip() if amt else ''
+    return float(amt.translate(_AMOUNT_TABLE)) if amt else 0.0
 
 def open_excel(filename, password):
     """Open an encrypted Excel file and return a decrypted buffer."""
@@ -33,19 +53,17 @@ def open_excel(filename, password):
     return None
 
 def extract_transaction(row, next_row):
-    """Extract a transaction dictionary from a row and its corresponding next row."""
-    date_str = row[4].value.strip()
-    description = row[7].value.strip() if row[7].value else ''
-    incoming = row[15].value.strip() if row[15].value else ''
-    outgoing = row[18].value.strip() if row[18].value else ''
-    balance = row[21].value.strip() if row[21].value else ''
+    """Extract a transaction dictionary from a row's cell values and those of its next row."""
+    date_str = row[4].strip()
+    description = row[7].strip() if row[7] else ''
+    incoming = row[15].strip() if row[15] else ''
+    outgoing = row[18].strip() if row[18] else ''
+    balance = row[21].strip() if row[21] else ''
 
-    time_str = next_row[4].value.split()[0] if next_row[4].value else '00:00:00'
-    datetime_str = f"{date_str} {time_str}"
-    datetime_obj = datetime.strptime(datetime_str, '%d %b %Y %H:%M:%S')
+    time_str = next_row[4].split()[0] if next_row[4] else '00:00:00'
 
     return {
-        'date': datetime_obj,
+        'date': parse_datetime(date_str, time_str),
         'description': description,
         'incoming': parse_amount(incoming),
         'outgoing': parse_amount(outgoing),
@@ -54,18 +72,32 @@ def extract_transaction(row, next_row):
 
 def parse_excel_data(decrypted_buffer):
     """Parse the decrypted Excel data and extract transactions."""
-    wb = openpyxl.load_workbook(decrypted_buffer)
-    sheet = wb['e-Statement']
-
+    # Only cell values are read, so the sheet is streamed instead of building a Cell object per cell
+    wb = openpyxl.load_workbook(decrypted_buffer, read_only=True, data_only=True, keep_links=False)
+    period = None
     transactions = []
-
-    for row in sheet.iter_rows(min_row=1):
-        if row[0].value is not None and isinstance(row[0].value, float):
-            next_row = sheet[row[0].row + 1]
-            transaction = extract_transaction(row, next_row)
-            transactions.append(transaction)
+    try:
+        sheet = wb['e-Statement']
+        # Streaming trusts the sheet's dimension record, which exports may leave out or get wrong
+        sheet.reset_dimensions()
+        # One forward pass: a transaction row is emitted once the row below it, holding its time, arrives
+        prev = None
+        rows = sheet.iter_rows(max_col=STATEMENT_COLUMNS, values_only=True)
+        for number, row in enumerate(rows, start=1):
+            if len(row) < STATEMENT_COLUMNS:
+                # Pad empty or short rows rather than dropping them, so row numbers stay aligned
+                row = (*row, *(None,) * (STATEMENT_COLUMNS - len(row)))
+            if number == 6:
+                period = row[13]
+            if prev is not None and isinstance(prev[0], float):
+                transactions.append(extract_transaction(prev, row))
+            prev = row
+        if prev is not None and isinstance(prev[0], float):
+            transactions.append(extract_transaction(prev, (None,) * STATEMENT_COLUMNS))
+    finally:
+        wb.close()
 
     return {
-        "period": sheet.cell(row=6, column=14).value,
+        "period": period,
         "transactions": transactions
     }
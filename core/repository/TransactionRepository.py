@@ -1,30 +1,200 @@
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql import text
-from sqlalchemy import and_
-from datetime import date
-from core.database import BankTransaction, Session, BankAccount
+from sqlalchemy import and_, case, func, insert, or_, select, update
+from datetime import date, datetime, time, timedelta
+from core.database import BankTransaction, Session, BankAccount, Category, TransactionStats
 from core.repository.base import BaseRepository
 
 
+def _day_range(start_date: date, end_date: date):
+    """
+    Widen a date range to whole days: from midnight of start_date up to, but not including,
+    midnight after end_date. Datetimes are truncated to their day, so any two ranges over the
+    same days produce identical query parameters.
+    """
+    return datetime.combine(start_date, time.min), datetime.combine(end_date, time.min) + timedelta(days=1)
+
+
+def _raise_to(column, value):
+    """SQL expression for the larger of a nullable column and a value, which may be None."""
+    if value is None:
+        return column
+    return case((or_(column == None, column < value), value), else_=column)
+
+
+def _lower_to(column, value):
+    """SQL expression for the smaller of a nullable column and a value, which may be None."""
+    if value is None:
+        return column
+    return case((or_(column == None, column > value), value), else_=column)
+
+
 class TransactionRepository(BaseRepository[BankTransaction]):
     """Repository for managing bank transactions."""
     def __init__(self, db: Session):
         super().__init__(db, BankTransaction)
 
+    def _insert_skipping_duplicates(self):
+        """
+        Build an INSERT that leaves rows clashing with uq_user_date untouched instead of failing.
+
+        Its rowcount is the number of rows actually inserted, leaving out the skipped ones.
+        Returns None on dialects without such a clause.
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == 'mysql':
+            from sqlalchemy.dialects.mysql import insert as mysql_insert
+            # Not a no-op ON DUPLICATE KEY UPDATE: with the CLIENT_FOUND_ROWS flag SQLAlchemy sets,
+            # a kept duplicate would count as an affected row just like an inserted one
+            return mysql_insert(BankTransaction).prefix_with('IGNORE')
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+            return pg_insert(BankTransaction).on_conflict_do_nothing()
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+            return sqlite_insert(BankTransaction).on_conflict_do_nothing()
+        return None
+
     def insert_transaction(self, transactions, bank_account: BankAccount):
-        """Insert transactions into the database."""
+        """
+        Insert transactions into the database, skipping ones that are already stored.
+
+        Dates already stored for the account are looked up in one indexed query over the
+        statement's date range, and only the new rows go out, in one executemany and one commit.
+        """
+        if not transactions:
+            return
+        dates = [transaction["date"] for transaction in transactions]
+        existing = set(self.db.scalars(
+            select(BankTransaction.date).where(
+                BankTransaction.user_id == bank_account.id,
+                BankTransaction.date.between(min(dates), max(dates))
+            )
+        ))
+        rows = []
         for transaction in transactions:
-            try:
-                self.create({
-                    "date": transaction["date"],
-                    "description": transaction["description"].strip(),
-                    "incoming": transaction["incoming"],
-                    "outgoing": transaction["outgoing"],
-                    "balance": transaction["balance"],
-                    "user_id": bank_account.id
-                })
-            except IntegrityError:
-                self.db.rollback()
+            # A date repeated within the statement keeps its first row, as the insert would
+            if transaction["date"] in existing:
+                continue
+            existing.add(transaction["date"])
+            rows.append({
+                "date": transaction["date"],
+                "description": transaction["description"].strip(),
+                "incoming": transaction["incoming"],
+                "outgoing": transaction["outgoing"],
+                "balance": transaction["balance"],
+                "user_id": bank_account.id
+            })
+        if not rows:
+            return
+
+        # Still skip duplicates in the statement, for rows stored meanwhile
+        stmt = self._insert_skipping_duplicates()
+        if stmt is not None:
+            # Run on the session's connection: an ORM-level execute does not report a rowcount
+            inserted = self.db.connection().execute(stmt, rows).rowcount
+            if inserted == len(rows):
+                self._add_to_stats(bank_account.id, rows)
+            else:
+                # Another import stored some of the rows first (or the driver cannot tell), and which
+                # rows were skipped is unknown, so the statistics are rebuilt on their next read
+                self._drop_stats(bank_account.id)
+            self.db.commit()
+            return
+
+        try:
+            self.db.execute(insert(BankTransaction), rows)
+            self._add_to_stats(bank_account.id, rows)
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            for row in rows:
+                try:
+                    self.create(row)
+                except IntegrityError:
+                    self.db.rollback()
+            # Which rows made it in is unknown, so the statistics are rebuilt on their next read
+            self._drop_stats(bank_account.id)
+            self.db.commit()
+
+    def update(self, db_obj: BankTransaction, obj_in: dict) -> BankTransaction:
+        """Update a transaction; the statistics of its account are rebuilt on their next read."""
+        for user_id in {db_obj.user_id, obj_in.get("user_id", db_obj.user_id)}:
+            self._drop_stats(user_id)
+        return super().update(db_obj, obj_in)
+
+    def delete(self, id_row: int) -> None:
+        """Delete a transaction; the statistics of its account are rebuilt on their next read."""
+        transaction = self.get(id_row)
+        if transaction:
+            self._drop_stats(transaction.user_id)
+        super().delete(id_row)
+
+    def _drop_stats(self, user_id):
+        """Discard the account's statistics so that their next read rebuilds them."""
+        self.db.query(TransactionStats).filter(TransactionStats.user_id == user_id).delete()
+
+    def _add_to_stats(self, user_id, rows):
+        """
+        Fold newly inserted rows into the account's statistics, if they have been built yet.
+
+        The rows are applied as one UPDATE relative to the stored totals, so imports running
+        at the same time add up instead of overwriting each other's results.
+        """
+        outgoing = [row["outgoing"] for row in rows if row["outgoing"] and row["outgoing"] > 0]
+        incoming = [row["incoming"] for row in rows if row["incoming"] and row["incoming"] > 0]
+        small_outgoing = [amount for amount in outgoing if amount < 10000]
+        _, max_id = self.get_transactions_version(user_id)
+        self.db.execute(
+            update(TransactionStats)
+            .where(TransactionStats.user_id == user_id)
+            .values(
+                total_transactions=TransactionStats.total_transactions + len(rows),
+                total_outcome=TransactionStats.total_outcome + sum(outgoing),
+                total_income=TransactionStats.total_income + sum(incoming),
+                outcome_count=TransactionStats.outcome_count + len(outgoing),
+                income_count=TransactionStats.income_count + len(incoming),
+                highest_outcome=_raise_to(TransactionStats.highest_outcome, max(outgoing, default=None)),
+                highest_income=_raise_to(TransactionStats.highest_income, max(incoming, default=None)),
+                lowest_outcome=_lower_to(TransactionStats.lowest_outcome, min(small_outgoing, default=None)),
+                lowest_income=_lower_to(TransactionStats.lowest_income, min(incoming, default=None)),
+                max_transaction_id=_raise_to(TransactionStats.max_transaction_id, max_id)
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def _build_stats(self, user_id):
+        """Compute an account's statistics from all its transactions and store them."""
+        outgoing = case((BankTransaction.outgoing > 0, BankTransaction.outgoing))
+        incoming = case((BankTransaction.incoming > 0, BankTransaction.incoming))
+        row = self.db.execute(
+            select(
+                func.count().label("total_transactions"),
+                func.coalesce(func.sum(outgoing), 0).label("total_outcome"),
+                func.coalesce(func.sum(incoming), 0).label("total_income"),
+                func.count(outgoing).label("outcome_count"),
+                func.count(incoming).label("income_count"),
+                func.max(outgoing).label("highest_outcome"),
+                func.max(incoming).label("highest_income"),
+                func.min(case((and_(BankTransaction.outgoing > 0, BankTransaction.outgoing < 10000),
+                               BankTransaction.outgoing))).label("lowest_outcome"),
+                func.min(incoming).label("lowest_income"),
+                func.max(BankTransaction.id).label("max_transaction_id")
+            ).where(
+                BankTransaction.user_id == user_id,
+                BankTransaction.deleted_at == None
+            )
+        ).one()
+
+        # Replaces a stale row in place
+        stats = self.db.merge(TransactionStats(user_id=user_id, **row._mapping))
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Built concurrently by another request; theirs is just as current
+            self.db.rollback()
+            stats = self.db.get(TransactionStats, user_id)
+        return stats
 
     def get_all_transactions(self, user_id):
         """Get all transactions for a user."""
@@ -39,34 +209,95 @@ class TransactionRepository(BaseRepository[BankTransaction]):
         )
         return transactions
 
+    def get_rows_for_charts(self, user_id):
+        """Get the chart-relevant columns of a user's transactions as lightweight rows."""
+        stmt = (
+            select(
+                BankTransaction.date,
+                BankTransaction.description,
+                BankTransaction.incoming,
+                BankTransaction.outgoing,
+                BankTransaction.balance,
+                BankTransaction.category_id
+            )
+            .where(
+                BankTransaction.user_id == user_id,
+                BankTransaction.deleted_at == None
+            )
+            .order_by(BankTransaction.date.desc())
+        )
+        return self.db.execute(stmt).all()
+
+    def stream_rows_for_report(self, user_id, batch_size: int = 1000):
+        """
+        Stream the date and amount columns of a user's transactions, newest first.
+
+        Rows are fetched from a server-side cursor in batches, so the full result set is never
+        buffered by the driver while the report charts copy the columns out.
+        """
+        stmt = (
+            select(
+                BankTransaction.date,
+                BankTransaction.incoming,
+                BankTransaction.outgoing,
+                BankTransaction.balance
+            )
+            .where(
+                BankTransaction.user_id == user_id,
+                BankTransaction.deleted_at == None
+            )
+            .order_by(BankTransaction.date.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        return self.db.execute(stmt)
+
+    def get_transactions_version(self, user_id):
+        """Get a cheap fingerprint (row count, highest id) of a user's transactions."""
+        count, max_id = (
+            self.db.query(func.count(BankTransaction.id), func.max(BankTransaction.id))
+            .filter(
+                BankTransaction.user_id == user_id,
+                BankTransaction.deleted_at == None
+            )
+            .one()
+        )
+        return count, max_id
+
     def get_transaction_statistics(self, user_id):
-        """Get transaction statistics for a user."""
-        query = """
-            SELECT
-                COUNT(*)                                                   AS total_transactions,
-                SUM(IF(outgoing > 0, outgoing, 0))                         AS total_outcome,
-                SUM(IF(incoming > 0, incoming, 0))                         AS total_income,
-                MAX(IF(outgoing > 0, outgoing, NULL))                      AS highest_outcome,
-                MAX(IF(incoming > 0, incoming, NULL))                      AS highest_income,
-                MIN(IF(outgoing > 0 AND outgoing < 10000, outgoing, NULL)) AS lowest_outcome,
-                MIN(IF(incoming > 0, incoming, NULL))                      AS lowest_income,
-                AVG(IF(outgoing > 0, outgoing, NULL))                      AS avg_outcome,
-                AVG(IF(incoming > 0, incoming, NULL)) AS avg_income
-            FROM bank_transactions
-            WHERE user_id = :user_id AND deleted_at IS NULL
         """
-        result = self.db.execute(text(query), {"user_id": user_id}).fetchone()
-        return result._mapping
+        Get transaction statistics for a user.
+
+        They are read from the account's transaction_stats row, which insert_transaction keeps
+        current. The row is rebuilt from one pass over the transactions when it is missing or
+        its version no longer matches the transactions, e.g. because it was built while an
+        import was still uncommitted.
+        """
+        stats = self.db.get(TransactionStats, user_id)
+        version = self.get_transactions_version(user_id)
+        if stats is None or (stats.total_transactions, stats.max_transaction_id) != version:
+            stats = self._build_stats(user_id)
+        return {
+            "total_transactions": stats.total_transactions,
+            "total_outcome": stats.total_outcome,
+            "total_income": stats.total_income,
+            "highest_outcome": stats.highest_outcome,
+            "highest_income": stats.highest_income,
+            "lowest_outcome": stats.lowest_outcome,
+            "lowest_income": stats.lowest_income,
+            "avg_outcome": stats.total_outcome / stats.outcome_count if stats.outcome_count else None,
+            "avg_income": stats.total_income / stats.income_count if stats.income_count else None,
+        }
 
     def get_transactions_by_date_range(self, user_id: int, start_date: date, end_date: date):
-        """Get transactions within a specific date range for a user."""
+        """Get transactions within a specific date range for a user, both end days included."""
+        range_start, range_end = _day_range(start_date, end_date)
         transactions = (
             self.db.query(BankTransaction)
             .filter(
                 and_(
                     BankTransaction.user_id == user_id,
-                    BankTransaction.date >= start_date,
-                    BankTransaction.date <= end_date,
+                    BankTransaction.date >= range_start,
+                    BankTransaction.date < range_end,
                     BankTransaction.deleted_at == None
                 )
             )
@@ -75,8 +306,58 @@ class TransactionRepository(BaseRepository[BankTransaction]):
         )
         return transactions
 
+    def get_spending_by_category(self, user_id: int, start_date: date, end_date: date):
+        """
+        Total the spending of a user per category within a date range, both end days included.
+
+        Aggregated by the database, so only one row per category is fetched.
+
+        Returns:
+            Dict of category name (None for uncategorized transactions) -> total outgoing amount
+        """
+        range_start, range_end = _day_range(start_date, end_date)
+        rows = (
+            self.db.query(Category.name, func.sum(func.abs(BankTransaction.outgoing)))
+            .select_from(BankTransaction)
+            .outerjoin(Category, BankTransaction.category_id == Category.id)
+            .filter(
+                BankTransaction.user_id == user_id,
+                BankTransaction.date >= range_start,
+                BankTransaction.date < range_end,
+                BankTransaction.outgoing != None,
+                BankTransaction.deleted_at == None
+            )
+            .group_by(Category.name)
+            .all()
+        )
+        return {name: total or 0.0 for name, total in rows}
+
+    def count_transactions(self, user_id: int) -> int:
+        """Count all of a user's transactions."""
+        return (
+            self.db.query(func.count(BankTransaction.id))
+            .filter(BankTransaction.user_id == user_id, BankTransaction.deleted_at == None)
+            .scalar()
+        )
+
+    def count_transactions_by_date_range(self, user_id: int, start_date: date, end_date: date) -> int:
+        """Count a user's transactions within a specific date range, both end days included."""
+        range_start, range_end = _day_range(start_date, end_date)
+        return (
+            self.db.query(func.count(BankTransaction.id))
+            .filter(
+                and_(
+                    BankTransaction.user_id == user_id,
+                    BankTransaction.date >= range_start,
+                    BankTransaction.date < range_end,
+                    BankTransaction.deleted_at == None
+                )
+            )
+            .scalar()
+        )
+
     def get_transaction_statistics_by_date_range(self, start_date: date, end_date: date):
-        """Get transaction statistics within a specific date range."""
+        """Get transaction statistics within a specific date range, both end days included."""
         query = """
             SELECT
                 COUNT(*)                                                   AS total_transactions,
@@ -89,9 +370,10 @@ class TransactionRepository(BaseRepository[BankTransaction]):
                 AVG(IF(outgoing > 0, outgoing, NULL))                      AS avg_outcome,
                 AVG(IF(incoming > 0, incoming, NULL)) AS avg_income
             FROM bank_transactions
-            WHERE date BETWEEN :start_date AND :end_date AND deleted_at IS NULL
+            WHERE date >= :range_start AND date < :range_end AND deleted_at IS NULL
         """
-        result = self.db.execute(text(query), {"start_date": start_date, "end_date": end_date}).fetchone()
+        range_start, range_end = _day_range(start_date, end_date)
+        result = self.db.execute(text(query), {"range_start": range_start, "range_end": range_end}).fetchone()
         return result._mapping
 
     def get_user_date_bounds(self, user_id: int):
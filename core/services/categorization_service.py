@@ -1,69 +1,112 @@
 import re
-from typing import Dict, Optional, List
+from typing import Dict, Iterable, Optional, List
 from collections import defaultdict
 from core.database import Session, Category, Subcategory, BankTransaction
 from core.repository.TransactionRepository import TransactionRepository
 
 
+# Keyword patterns for categorization, checked in order; the first matching category wins
+CATEGORY_KEYWORDS = {
+    "Food & Dining": [
+        r'\b(restaurant|cafe|coffee|mcdonald|kfc|pizza|bakery|resto|warung|makan|nasi|ayam|soto|gado|rendang|padang|chinese|japanese|korean|thai|indian|western|buffet|catering|delivery|gofood|grabfood|shopeefood|foodpanda)\b',
+        r'\b(food|dining|lunch|dinner|breakfast|snack|drink|beverage|starbucks|dunkin|chatime|koi|teh|jco|breadtalk|hokben|yoshinoya|pepper|solaria|es teler|martabak|bakso|mie ayam)\b',
+        r'\b(supermarket|hypermarket|alfamart|indomaret|carrefour|giant|hero|ranch market|farmers market|total buah|sayur|daging|ikan|beras|minyak|gula|tepung|susu|telur)\b'
+    ],
+    "Transportation": [
+        r'\b(taxi|grab|gojek|uber|ojek|angkot|bus|kereta|mrt|lrt|transjakarta|damri|travel|rental|sewa|mobil|motor|bensin|pertamax|solar|parkir|tol|e-toll|mandiri e-toll)\b',
+        r'\b(garasi|bengkel|service|oli|ban|aki|sparepart|otomotif|honda|toyota|yamaha|suzuki|kawasaki|daihatsu|mitsubishi|nissan|ford|chevrolet)\b',
+        r'\b(fuel|gas|gasoline|petrol|diesel|premium|pertalite|dexlite|biosolar|bbm|spbu|shell|bp|total|vivo|esso)\b'
+    ],
+    "Shopping": [
+        r'\b(mall|plaza|shopping|store|toko|shop|market|pasar|department|boutique|fashion|clothing|baju|celana|sepatu|tas|jam|aksesoris|kosmetik|parfum|skincare)\b',
+        r'\b(tokopedia|shopee|lazada|blibli|bukalapak|zalora|jd\.id|elevenia|orami|sociolla|female daily|zilingo|bhinneka|amazon|alibaba|ebay)\b',
+        r'\b(elektronik|gadget|laptop|hp|smartphone|tablet|tv|kulkas|ac|mesin cuci|kompor|setrika|vacuum|printer|kamera|headphone|speaker)\b'
+    ],
+    "Health & Fitness": [
+        r'\b(hospital|rumah sakit|rs|klinik|clinic|dokter|doctor|medical|kesehatan|obat|pharmacy|apotek|kimia farma|guardian|watson|century|viva)\b',
+        r'\b(gym|fitness|olahraga|sport|yoga|pilates|zumba|senam|renang|tennis|badminton|football|basket|volleyball|golf|boxing|martial arts)\b',
+        r'\b(vitamin|supplement|protein|medicine|tablet|kapsul|sirup|salep|plester|termometer|masker|hand sanitizer|antiseptic)\b'
+    ],
+    "Entertainment": [
+        r'\b(cinema|bioskop|xxi|cgv|cineplex|movie|film|theater|concert|konser|musik|netflix|spotify|youtube|disney|hbo|amazon prime|apple tv)\b',
+        r'\b(game|gaming|steam|playstation|xbox|nintendo|mobile legend|pubg|free fire|valorant|dota|genshin|among us|roblox|minecraft)\b',
+        r'\b(book|buku|gramedia|kinokuniya|periplus|togamas|library|perpustakaan|novel|komik|manga|magazine|majalah|koran|newspaper)\b'
+    ],
+    "Personal Care": [
+        r'\b(salon|barbershop|pangkas|potong|rambut|hair|nail|kuku|spa|massage|facial|treatment|kecantikan|beauty|salon kecantikan)\b',
+        r'\b(shampoo|conditioner|sabun|pasta gigi|sikat gigi|deodorant|cologne|lotion|cream|serum|toner|cleanser|moisturizer|sunscreen)\b'
+    ],
+    "Bills & Utilities": [
+        r'\b(listrik|pln|gas|pdam|air|telepon|telkom|indihome|internet|wifi|tv kabel|first media|biznet|mnc|transvision|k-vision)\b',
+        r'\b(pajak|tax|pbb|bphtb|stnk|sim|bpjs|insurance|asuransi|premi|iuran|membership|langganan|subscription|netflix|spotify)\b',
+        r'\b(bank|atm|admin|administration|biaya admin|transfer|transfer fee|bunga|interest|denda|penalty|maintenance fee)\b'
+    ],
+    "Transfers & Banking": [
+        r'\b(transfer|kirim|send|tarik|withdraw|setor|deposit|nabung|saving|investasi|investment|reksadana|saham|obligasi|deposito)\b',
+        r'\b(atm|mobile banking|internet banking|m-banking|sms banking|phone banking|teller|cs|customer service)\b'
+    ],
+    "Income": [
+        r'\b(gaji|salary|bonus|thr|insentif|incentive|komisi|commission|honorarium|fee|upah|pendapatan|income|revenue|profit|dividen)\b',
+        r'\b(freelance|konsultan|consultant|jasa|service|project|kontrak|contract|royalty|patent|copyright|licensing)\b'
+    ],
+    "Education": [
+        r'\b(sekolah|school|universitas|university|kuliah|college|kursus|course|les|tutorial|training|seminar|workshop|conference)\b',
+        r'\b(spp|uang sekolah|tuition|buku|book|alat tulis|stationery|laptop|uniform|seragam|tas sekolah|sepatu sekolah)\b'
+    ],
+    "Travel": [
+        r'\b(hotel|resort|villa|penginapan|homestay|airbnb|agoda|traveloka|tiket|ticket|pesawat|airplane|garuda|lion|citilink|airasia)\b',
+        r'\b(wisata|tour|travel|liburan|vacation|holiday|trip|backpack|guide|pemandu|souvenir|oleh-oleh|gift|hadiah)\b'
+    ]
+}
+
+# Subcategory-specific keywords
+SUBCATEGORY_KEYWORDS = {
+    # Food & Dining subcategories
+    "Restaurants": [r'\b(restaurant|resto|dining|fine dining|casual dining)\b'],
+    "Fast Food": [r'\b(mcdonald|kfc|burger|pizza|fast food|quick service)\b'],
+    "Coffee & Beverages": [r'\b(coffee|cafe|starbucks|dunkin|tea|beverage|drink|chatime|koi)\b'],
+    "Groceries & Supermarkets": [r'\b(supermarket|hypermarket|alfamart|indomaret|carrefour|giant|grocery)\b'],
+    "Street Food": [r'\b(warung|pedagang|street|jajanan|gorengan|bakso|mie ayam)\b'],
+
+    # Transportation subcategories
+    "Public Transport": [r'\b(bus|kereta|mrt|lrt|transjakarta|angkot|public)\b'],
+    "Taxi & Ride Sharing": [r'\b(taxi|grab|gojek|uber|ojek|ride)\b'],
+    "Fuel": [r'\b(bensin|pertamax|solar|fuel|gas|spbu|shell|bp)\b'],
+    "Parking": [r'\b(parkir|parking|park)\b'],
+    "Vehicle Maintenance": [r'\b(bengkel|service|oli|ban|maintenance|repair)\b'],
+
+    # Shopping subcategories
+    "Online Shopping": [r'\b(tokopedia|shopee|lazada|blibli|online|e-commerce)\b'],
+    "Electronics": [r'\b(laptop|hp|smartphone|tv|elektronik|gadget)\b'],
+    "Clothing & Fashion": [r'\b(baju|celana|sepatu|fashion|clothing|boutique)\b'],
+}
+
+
+def _compile_keywords(keywords: Dict[str, List[str]]) -> Dict[str, re.Pattern]:
+    """Join each name's patterns into one compiled alternation so a description is scanned once per name."""
+    return {
+        name: re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+        for name, patterns in keywords.items()
+    }
+
+
+# Matching stays on compiled re patterns: the scan runs in the C regex engine, and a numeric
+# JIT (e.g. Numba) has nothing to offer for text matching.
+CATEGORY_PATTERNS = _compile_keywords(CATEGORY_KEYWORDS)
+SUBCATEGORY_PATTERNS = _compile_keywords(SUBCATEGORY_KEYWORDS)
+
+
 class CategorizationService:
     """Service for automatic transaction categorization."""
 
     def __init__(self):
         self.session = Session()
 
-        # Define keyword patterns for categorization
-        self.category_keywords = {
-            "Food & Dining": [
-                r'\b(restaurant|cafe|coffee|mcdonald|kfc|pizza|bakery|resto|warung|makan|nasi|ayam|soto|gado|rendang|padang|chinese|japanese|korean|thai|indian|western|buffet|catering|delivery|gofood|grabfood|shopeefood|foodpanda)\b',
-                r'\b(food|dining|lunch|dinner|breakfast|snack|drink|beverage|starbucks|dunkin|chatime|koi|teh|jco|breadtalk|hokben|yoshinoya|pepper|solaria|es teler|martabak|bakso|mie ayam)\b',
-                r'\b(supermarket|hypermarket|alfamart|indomaret|carrefour|giant|hero|ranch market|farmers market|total buah|sayur|daging|ikan|beras|minyak|gula|tepung|susu|telur)\b'
-            ],
-            "Transportation": [
-                r'\b(taxi|grab|gojek|uber|ojek|angkot|bus|kereta|mrt|lrt|transjakarta|damri|travel|rental|sewa|mobil|motor|bensin|pertamax|solar|parkir|tol|e-toll|mandiri e-toll)\b',
-                r'\b(garasi|bengkel|service|oli|ban|aki|sparepart|otomotif|honda|toyota|yamaha|suzuki|kawasaki|daihatsu|mitsubishi|nissan|ford|chevrolet)\b',
-                r'\b(fuel|gas|gasoline|petrol|diesel|premium|pertalite|dexlite|biosolar|bbm|spbu|shell|bp|total|vivo|esso)\b'
-            ],
-            "Shopping": [
-                r'\b(mall|plaza|shopping|store|toko|shop|market|pasar|department|boutique|fashion|clothing|baju|celana|sepatu|tas|jam|aksesoris|kosmetik|parfum|skincare)\b',
-                r'\b(tokopedia|shopee|lazada|blibli|bukalapak|zalora|jd\.id|elevenia|orami|sociolla|female daily|zilingo|bhinneka|amazon|alibaba|ebay)\b',
-                r'\b(elektronik|gadget|laptop|hp|smartphone|tablet|tv|kulkas|ac|mesin cuci|kompor|setrika|vacuum|printer|kamera|headphone|speaker)\b'
-            ],
-            "Health & Fitness": [
-                r'\b(hospital|rumah sakit|rs|klinik|clinic|dokter|doctor|medical|kesehatan|obat|pharmacy|apotek|kimia farma|guardian|watson|century|viva)\b',
-                r'\b(gym|fitness|olahraga|sport|yoga|pilates|zumba|senam|renang|tennis|badminton|football|basket|volleyball|golf|boxing|martial arts)\b',
-                r'\b(vitamin|supplement|protein|medicine|tablet|kapsul|sirup|salep|plester|termometer|masker|hand sanitizer|antiseptic)\b'
-            ],
-            "Entertainment": [
-                r'\b(cinema|bioskop|xxi|cgv|cineplex|movie|film|theater|concert|konser|musik|netflix|spotify|youtube|disney|hbo|amazon prime|apple tv)\b',
-                r'\b(game|gaming|steam|playstation|xbox|nintendo|mobile legend|pubg|free fire|valorant|dota|genshin|among us|roblox|minecraft)\b',
-                r'\b(book|buku|gramedia|kinokuniya|periplus|togamas|library|perpustakaan|novel|komik|manga|magazine|majalah|koran|newspaper)\b'
-            ],
-            "Personal Care": [
-                r'\b(salon|barbershop|pangkas|potong|rambut|hair|nail|kuku|spa|massage|facial|treatment|kecantikan|beauty|salon kecantikan)\b',
-                r'\b(shampoo|conditioner|sabun|pasta gigi|sikat gigi|deodorant|cologne|lotion|cream|serum|toner|cleanser|moisturizer|sunscreen)\b'
-            ],
-            "Bills & Utilities": [
-                r'\b(listrik|pln|gas|pdam|air|telepon|telkom|indihome|internet|wifi|tv kabel|first media|biznet|mnc|transvision|k-vision)\b',
-                r'\b(pajak|tax|pbb|bphtb|stnk|sim|bpjs|insurance|asuransi|premi|iuran|membership|langganan|subscription|netflix|spotify)\b',
-                r'\b(bank|atm|admin|administration|biaya admin|transfer|transfer fee|bunga|interest|denda|penalty|maintenance fee)\b'
-            ],
-            "Transfers & Banking": [
-                r'\b(transfer|kirim|send|tarik|withdraw|setor|deposit|nabung|saving|investasi|investment|reksadana|saham|obligasi|deposito)\b',
-                r'\b(atm|mobile banking|internet banking|m-banking|sms banking|phone banking|teller|cs|customer service)\b'
-            ],
-            "Income": [
-                r'\b(gaji|salary|bonus|thr|insentif|incentive|komisi|commission|honorarium|fee|upah|pendapatan|income|revenue|profit|dividen)\b',
-                r'\b(freelance|konsultan|consultant|jasa|service|project|kontrak|contract|royalty|patent|copyright|licensing)\b'
-            ],
-            "Education": [
-                r'\b(sekolah|school|universitas|university|kuliah|college|kursus|course|les|tutorial|training|seminar|workshop|conference)\b',
-                r'\b(spp|uang sekolah|tuition|buku|book|alat tulis|stationery|laptop|uniform|seragam|tas sekolah|sepatu sekolah)\b'
-            ],
-            "Travel": [
-                r'\b(hotel|resort|villa|penginapan|homestay|airbnb|agoda|traveloka|tiket|ticket|pesawat|airplane|garuda|lion|citilink|airasia)\b',
-                r'\b(wisata|tour|travel|liburan|vacation|holiday|trip|backpack|guide|pemandu|souvenir|oleh-oleh|gift|hadiah)\b'
-            ]
-        }
+        self.category_keywords = CATEGORY_KEYWORDS
+
+        # Category rows by name and subcategory rows by category id, loaded on first use
+        self._categories: Dict[str, Optional[Category]] = {}
+        self._subcategories: Dict[int, List[Subcategory]] = {}
 
     def categorize_transaction(self, description: str) -> Optional[Dict[str, any]]:
         """
@@ -78,62 +121,60 @@ class CategorizationService:
         description_lower = description.lower()
 
         # Try to match against category keywords
-        for category_name, patterns in self.category_keywords.items():
-            for pattern in patterns:
-                if re.search(pattern, description_lower, re.IGNORECASE):
-                    # Get category from database
-                    category = self.session.query(Category).filter(
-                        Category.name == category_name,
-                        Category.deleted_at.is_(None)
-                    ).first()
-
-                    if category:
-                        # Try to find a more specific subcategory
-                        subcategory = self._find_subcategory(description_lower, category.id)
-
-                        return {
-                            'category_id': category.id,
-                            'subcategory_id': subcategory.id if subcategory else None,
-                            'category_name': category_name,
-                            'subcategory_name': subcategory.name if subcategory else None
-                        }
+        for category_name, pattern in CATEGORY_PATTERNS.items():
+            if pattern.search(description_lower):
+                # Get category from database
+                category = self._get_category(category_name)
+
+                if category:
+                    # Try to find a more specific subcategory
+                    subcategory = self._find_subcategory(description_lower, category.id)
+
+                    return {
+                        'category_id': category.id,
+                        'subcategory_id': subcategory.id if subcategory else None,
+                        'category_name': category_name,
+                        'subcategory_name': subcategory.name if subcategory else None
+                    }
 
         return None
 
+    def categorize_descriptions(self, descriptions: Iterable[str]) -> Dict[str, Optional[Dict[str, any]]]:
+        """
+        Categorize many transaction descriptions at once.
+
+        Each distinct description is matched only once, since statements repeat the same
+        merchant and transfer texts across many transactions.
+
+        Returns:
+            Dict mapping each distinct description to its categorize_transaction result
+        """
+        return {description: self.categorize_transaction(description)
+                for description in dict.fromkeys(descriptions)}
+
+    def _get_category(self, category_name: str) -> Optional[Category]:
+        """Look up an active category by name, caching the result for this service."""
+        if category_name not in self._categories:
+            self._categories[category_name] = self.session.query(Category).filter(
+                Category.name == category_name,
+                Category.deleted_at.is_(None)
+            ).first()
+        return self._categories[category_name]
+
     def _find_subcategory(self, description: str, category_id: int) -> Optional[Subcategory]:
         """Find the most appropriate subcategory for a transaction."""
-        subcategories = self.session.query(Subcategory).filter(
-            Subcategory.category_id == category_id,
-            Subcategory.deleted_at.is_(None)
-        ).all()
-
-        # Define subcategory-specific keywords
-        subcategory_keywords = {
-            # Food & Dining subcategories
-            "Restaurants": [r'\b(restaurant|resto|dining|fine dining|casual dining)\b'],
-            "Fast Food": [r'\b(mcdonald|kfc|burger|pizza|fast food|quick service)\b'],
-            "Coffee & Beverages": [r'\b(coffee|cafe|starbucks|dunkin|tea|beverage|drink|chatime|koi)\b'],
-            "Groceries & Supermarkets": [r'\b(supermarket|hypermarket|alfamart|indomaret|carrefour|giant|grocery)\b'],
-            "Street Food": [r'\b(warung|pedagang|street|jajanan|gorengan|bakso|mie ayam)\b'],
-
-            # Transportation subcategories
-            "Public Transport": [r'\b(bus|kereta|mrt|lrt|transjakarta|angkot|public)\b'],
-            "Taxi & Ride Sharing": [r'\b(taxi|grab|gojek|uber|ojek|ride)\b'],
-            "Fuel": [r'\b(bensin|pertamax|solar|fuel|gas|spbu|shell|bp)\b'],
-            "Parking": [r'\b(parkir|parking|park)\b'],
-            "Vehicle Maintenance": [r'\b(bengkel|service|oli|ban|maintenance|repair)\b'],
-
-            # Shopping subcategories
-            "Online Shopping": [r'\b(tokopedia|shopee|lazada|blibli|online|e-commerce)\b'],
-            "Electronics": [r'\b(laptop|hp|smartphone|tv|elektronik|gadget)\b'],
-            "Clothing & Fashion": [r'\b(baju|celana|sepatu|fashion|clothing|boutique)\b'],
-        }
+        subcategories = self._subcategories.get(category_id)
+        if subcategories is None:
+            subcategories = self.session.query(Subcategory).filter(
+                Subcategory.category_id == category_id,
+                Subcategory.deleted_at.is_(None)
+            ).all()
+            self._subcategories[category_id] = subcategories
 
         for subcategory in subcategories:
-            patterns = subcategory_keywords.get(subcategory.name, [])
-            for pattern in patterns:
-                if re.search(pattern, description, re.IGNORECASE):
-                    return subcategory
+            pattern = SUBCATEGORY_PATTERNS.get(subcategory.name)
+            if pattern and pattern.search(description):
+                return subcategory
 
         return None
 
@@ -166,10 +207,12 @@ class CategorizationService:
             'categories_assigned': defaultdict(int)
         }
 
+        categorizations = self.categorize_descriptions(t.description for t in uncategorized_transactions)
+
         for transaction in uncategorized_transactions:
             stats['total_processed'] += 1
 
-            categorization = self.categorize_transaction(transaction.description)
+            categorization = categorizations[transaction.description]
 
             if categorization:
                 # Update the transaction with category information
@@ -184,6 +227,10 @@ class CategorizationService:
         # Commit changes
         self.session.commit()
 
+        if stats['successfully_categorized']:
+            from core.cache.df_cache import invalidate_user_frame
+            invalidate_user_frame(account.id)
+
         return dict(stats)
 
     def get_categorization_statistics(self, user_id: int) -> Dict[str, any]:
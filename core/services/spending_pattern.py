@@ -56,33 +56,17 @@ class FinancialAnalysisService:
         if not account:
             return {}
 
-        # Get transactions from last 30 days
+        # Get spending of the last 30 days
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=30)
 
-        recent_transactions = self.transaction_repo.get_transactions_by_date_range(
-            account.id, start_date, end_date
-        )
-
-        # Get transactions from previous 30 days for comparison
-        prev_end_date = start_date
-        prev_start_date = prev_end_date - timedelta(days=30)
-
-        prev_transactions = self.transaction_repo.get_transactions_by_date_range(
-            account.id, prev_start_date, prev_end_date
-        )
+        recent_category_spending = self._get_category_spending(account.id, start_date, end_date)
 
-        # Analyze categories
-        recent_category_spending = defaultdict(float)
-        prev_category_spending = defaultdict(float)
+        # Get spending of the previous 30 days for comparison
+        prev_end_date = start_date - timedelta(days=1)
+        prev_start_date = start_date - timedelta(days=30)
 
-        for t in recent_transactions:
-            category = self._get_transaction_category(t)
-            recent_category_spending[category] += abs(t.outgoing or 0)
-
-        for t in prev_transactions:
-            category = self._get_transaction_category(t)
-            prev_category_spending[category] += abs(t.outgoing or 0)
+        prev_category_spending = self._get_category_spending(account.id, prev_start_date, prev_end_date)
 
         # Calculate changes
         insights = {}
@@ -117,15 +101,8 @@ class FinancialAnalysisService:
                         if current_month.month < 12
                         else current_month.replace(year=current_month.year + 1, month=1)) - timedelta(days=1)
 
-        current_month_transactions = self.transaction_repo.get_transactions_by_date_range(
-            account.id, current_month, end_of_month
-        )
-
         # Calculate spending by category
-        category_spending = defaultdict(float)
-        for t in current_month_transactions:
-            category = self._get_transaction_category(t)
-            category_spending[category] += abs(t.outgoing or 0)
+        category_spending = self._get_category_spending(account.id, current_month, end_of_month)
 
         budget_status = {}
         for budget in budgets:
@@ -305,11 +282,13 @@ class FinancialAnalysisService:
             'recommendations': self._get_health_recommendations(score_components)
         }
 
-    def _get_transaction_category(self, transaction) -> str:
-        """Get category name for a transaction."""
-        if hasattr(transaction, 'category') and transaction.category:
-            return transaction.category.name if hasattr(transaction.category, 'name') else str(transaction.category)
-        return 'Uncategorized'
+    def _get_category_spending(self, user_id: int, start_date, end_date) -> Dict[str, float]:
+        """Get spending per category name within a date range, totalled by the database."""
+        category_spending = defaultdict(float)
+        totals = self.transaction_repo.get_spending_by_category(user_id, start_date, end_date)
+        for category, total in totals.items():
+            category_spending[category or 'Uncategorized'] += total
+        return category_spending
 
     def _alert_exists(self, user_id: int, alert_type: str, category: str = None) -> bool:
         """Check if a similar alert already exists."""
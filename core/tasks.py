@@ -1,7 +1,7 @@
 import asyncio
 import os
 
-from core.chart.report_generator import generate_all_charts, combine_charts
+from core.chart.report_generator import generate_report
 from core.database import Session
 from core.parser import parse_excel_data, open_excel
 from core.repository.BankAccountRepository import BankAccountRepository
@@ -38,7 +38,6 @@ def process_excel(file_path, user_id):
         transactions = parse_excel_data(decrypt_excel)
         bank_trx_repo = TransactionRepository(Session())
         bank_trx_repo.insert_transaction(transactions["transactions"], bank_account)
-        generate_all_charts(transactions["transactions"], user_id)
-        combine_charts(user_id, period=transactions["period"])
+        generate_report(transactions["transactions"], user_id, period=transactions["period"])
         return True
     return False
@@ -63,8 +63,8 @@ def check_configuration():
         logger.error(f"Configuration import error: {e}")
         return False
 
-def run_bot():
-    """Start the bot with proper error handling."""
+def main():
+    """Check the environment, then start the bot with proper error handling."""
     try:
         # Check dependencies first
         if not check_dependencies():
@@ -75,10 +75,10 @@ def run_bot():
             sys.exit(1)
         
         # Import bot modules after dependency check
-        from bot.main import run_bot as start_bot
+        from bot.main import run_bot
         
         logger.info("🚀 Starting Mandiri Statement Bot...")
-        start_bot()
+        run_bot()
         
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
@@ -88,4 +88,4 @@ def run_bot():
         sys.exit(1)
 
 if __name__ == "__main__":
-    run_bot()
+    main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Tests import the bot's packages from the repository root and never touch a real database
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
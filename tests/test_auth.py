@@ -0,0 +1,45 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from bot.utils import auth
+
+
+@pytest.fixture
+def accounts(monkeypatch):
+    """Serve account lookups from a dict and start every test with an empty cache."""
+    known = {}
+
+    @contextmanager
+    def fake_scope():
+        yield None
+
+    class FakeRepository:
+        def __init__(self, db):
+            pass
+
+        def get_by_telegram_id(self, telegram_id):
+            return SimpleNamespace(id=known[telegram_id]) if telegram_id in known else None
+
+    monkeypatch.setattr(auth, 'session_scope', fake_scope)
+    monkeypatch.setattr(auth, 'BankAccountRepository', FakeRepository)
+    monkeypatch.setattr(auth, '_registered_users', {})
+    return known
+
+
+def test_expired_entries_are_evicted_on_insert(accounts, monkeypatch):
+    accounts.update({'1': 10, '2': 20})
+    clock = [100.0]
+    monkeypatch.setattr(auth.time, 'monotonic', lambda: clock[0])
+
+    assert auth.get_registered_account_id('1') == 10
+    clock[0] += auth.AUTH_CACHE_TTL_SECONDS + 1
+    assert auth.get_registered_account_id('2') == 20
+
+    assert set(auth._registered_users) == {'2'}
+
+
+def test_unregistered_users_are_not_cached(accounts):
+    assert auth.get_registered_account_id('3') is None
+    assert auth._registered_users == {}
@@ -0,0 +1,29 @@
+import inspect
+from datetime import date
+
+import pytest
+
+from bot.utils import date_parser
+from bot.utils.date_parser import DateParseError, parse_flexible_date
+
+
+@pytest.mark.parametrize('name', [
+    'parse_flexible_date', '_parse_normalized_date', '_date_layout',
+    '_match_calendar_date', '_date_candidates', 'calculate_preset_dates',
+])
+def test_parsing_stays_plain_python(name):
+    """String parsing is regex and dict work; a JIT dispatcher here would only add compile overhead."""
+    func = inspect.unwrap(getattr(date_parser, name))
+    assert inspect.isfunction(func)
+    assert not hasattr(func, 'py_func')
+    assert not hasattr(func, 'signatures')
+
+
+@pytest.mark.parametrize('text', ['2024-12-25', '25/12/2024', 'Dec 25, 2024', '25 Dec 2024'])
+def test_parse_flexible_date_formats(text):
+    assert parse_flexible_date(text) == date(2024, 12, 25)
+
+
+def test_parse_flexible_date_rejects_garbage():
+    with pytest.raises(DateParseError):
+        parse_flexible_date('not a date')
@@ -0,0 +1,33 @@
+from datetime import date, datetime
+
+import numpy as np
+
+from core.cache import df_cache
+from core.chart.advanced_visuals import transactions_to_frame
+
+
+def _frame():
+    return transactions_to_frame([
+        {"date": datetime(2025, 5, 1, 9, 30), "description": "salary", "incoming": 1500.25,
+         "outgoing": None, "balance": 1500.25, "category_id": 3},
+        {"date": datetime(2025, 5, 2, 18, 0), "description": "coffee", "incoming": None,
+         "outgoing": 25.5, "balance": 1474.75, "category_id": None},
+    ])
+
+
+def test_transaction_arrays_layout(monkeypatch):
+    monkeypatch.setattr(df_cache, "get_or_build_df", lambda user_id: _frame())
+
+    ordinals, cents, category_ids = df_cache.get_user_transaction_arrays(42)
+
+    assert (ordinals.dtype, cents.dtype, category_ids.dtype) == (np.int32, np.int64, np.int32)
+    assert all(array.flags["C_CONTIGUOUS"] for array in (ordinals, cents, category_ids))
+    assert sorted(ordinals.tolist()) == [date(2025, 5, 1).toordinal(), date(2025, 5, 2).toordinal()]
+    assert sorted(cents.tolist()) == [-2550, 150025]
+    # Uncategorized transactions get the -1 sentinel
+    assert sorted(category_ids.tolist()) == [-1, 3]
+
+
+def test_transaction_arrays_without_account(monkeypatch):
+    monkeypatch.setattr(df_cache, "get_or_build_df", lambda user_id: None)
+    assert df_cache.get_user_transaction_arrays(42) is None
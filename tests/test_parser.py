@@ -0,0 +1,71 @@
+import io
+import re
+import zipfile
+from datetime import datetime
+
+import openpyxl
+import pytest
+
+from core.parser import parse_excel_data
+
+
+def _statement():
+    """Build a three-transaction e-Statement workbook laid out like Mandiri's export."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'e-Statement'
+    ws.cell(row=6, column=14, value='01 May 2025 - 31 May 2025')
+    for k, row in enumerate(range(10, 19, 3)):
+        ws.cell(row=row, column=1, value=k + 1.5)
+        ws.cell(row=row, column=5, value=f'0{k + 1} May 2025')
+        ws.cell(row=row, column=8, value=f' desc {k} ')
+        ws.cell(row=row, column=16, value='1.000,50' if k % 2 else None)
+        ws.cell(row=row, column=19, value=None if k % 2 else '200,00')
+        ws.cell(row=row, column=22, value='3.246.470,00')
+        ws.cell(row=row + 1, column=5, value=f'10:1{k}:00 WIB')
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _with_dimension(data, replacement):
+    """Rewrite the sheet's <dimension> record, or drop it when replacement is empty."""
+    source = zipfile.ZipFile(io.BytesIO(data))
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w') as target:
+        for item in source.infolist():
+            content = source.read(item.filename)
+            if item.filename == 'xl/worksheets/sheet1.xml':
+                content = re.sub(rb'<dimension ref="[^"]*"\s*/>', replacement, content)
+            target.writestr(item, content)
+    out.seek(0)
+    return out
+
+
+@pytest.mark.parametrize('dimension', [b'', b'<dimension ref="A1"/>'], ids=['missing', 'stale'])
+def test_parse_ignores_sheet_dimension(dimension):
+    result = parse_excel_data(_with_dimension(_statement(), dimension))
+
+    assert result['period'] == '01 May 2025 - 31 May 2025'
+    assert [t['date'] for t in result['transactions']] == [
+        datetime(2025, 5, 1, 10, 10), datetime(2025, 5, 2, 10, 11), datetime(2025, 5, 3, 10, 12)]
+    assert result['transactions'][1] == {
+        'date': datetime(2025, 5, 2, 10, 11),
+        'description': 'desc 1',
+        'incoming': 1000.5,
+        'outgoing': 0.0,
+        'balance': 3246470.0,
+    }
+
+
+def test_parse_reads_transaction_on_last_row():
+    wb = openpyxl.load_workbook(io.BytesIO(_statement()))
+    wb['e-Statement'].delete_rows(17)
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+
+    transactions = parse_excel_data(buffer)['transactions']
+
+    assert len(transactions) == 3
+    assert transactions[-1]['date'] == datetime(2025, 5, 3, 0, 0)
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base, BankAccount, BankTransaction, TransactionStats
+from core.repository.TransactionRepository import TransactionRepository
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def account(session):
+    acc = BankAccount(telegram_id="42", birth_date=datetime(2000, 1, 1))
+    session.add(acc)
+    session.commit()
+    return acc
+
+
+def _statement(first_hour, count):
+    """Transactions an hour apart, alternating between spending and income."""
+    start = datetime(2025, 5, 1)
+    return [{
+        "date": start + timedelta(hours=first_hour + i),
+        "description": f" trx {first_hour + i} ",
+        "incoming": None if i % 2 else 1000.0 + i,
+        "outgoing": 50.0 * (i + 1) if i % 2 else None,
+        "balance": 10000.0,
+    } for i in range(count)]
+
+
+def _fresh_stats(repo, user_id):
+    """Statistics rebuilt from every stored transaction, ignoring the running totals."""
+    repo.db.query(TransactionStats).delete()
+    repo.db.commit()
+    return repo.get_transaction_statistics(user_id)
+
+
+def test_reimporting_overlapping_statement_skips_stored_rows(session, account):
+    repo = TransactionRepository(session)
+    repo.insert_transaction(_statement(0, 10), account)
+    repo.insert_transaction(_statement(5, 10), account)
+
+    assert repo.count_transactions(account.id) == 15
+    assert session.query(BankTransaction).filter_by(description="trx 3").count() == 1
+
+
+def test_date_repeated_within_statement_keeps_first_row(session, account):
+    repo = TransactionRepository(session)
+    statement = _statement(0, 3)
+    statement.append({**statement[1], "description": "repeat", "outgoing": 999.0})
+    repo.insert_transaction(statement, account)
+
+    stored = session.query(BankTransaction).filter_by(date=statement[1]["date"]).all()
+    assert [t.description for t in stored] == ["trx 1"]
+
+
+def test_running_stats_match_a_rebuild(session, account):
+    repo = TransactionRepository(session)
+    repo.insert_transaction(_statement(0, 10), account)
+    # Build the running totals, then fold later imports into them
+    repo.get_transaction_statistics(account.id)
+    repo.insert_transaction(_statement(5, 10), account)
+    statement = _statement(20, 4)
+    statement.append(dict(statement[0]))
+    repo.insert_transaction(statement, account)
+
+    # The folded row still matches the transactions, so reading it does not rebuild it
+    stored = session.get(TransactionStats, account.id)
+    assert (stored.total_transactions, stored.max_transaction_id) == repo.get_transactions_version(account.id)
+    running = repo.get_transaction_statistics(account.id)
+    assert running["total_transactions"] == 19
+    assert running == pytest.approx(_fresh_stats(repo, account.id))
+
+
+def test_rows_stored_by_another_import_are_not_counted_twice(session, account, monkeypatch):
+    repo = TransactionRepository(session)
+    repo.insert_transaction(_statement(0, 10), account)
+    repo.get_transaction_statistics(account.id)
+
+    # Miss the stored dates, as if another import committed them after the lookup
+    monkeypatch.setattr(session, "scalars", lambda *args, **kwargs: iter(()))
+    repo.insert_transaction(_statement(5, 10), account)
+    monkeypatch.undo()
+
+    assert session.get(TransactionStats, account.id) is None
+    stats = repo.get_transaction_statistics(account.id)
+    assert stats["total_transactions"] == 15
+    assert stats == pytest.approx(_fresh_stats(repo, account.id))
+
+
+def test_soft_deleted_row_leaves_statistics(session, account):
+    repo = TransactionRepository(session)
+    repo.insert_transaction(_statement(0, 10), account)
+    repo.get_transaction_statistics(account.id)
+
+    largest = session.query(BankTransaction).filter_by(description="trx 9").one()
+    repo.delete(largest.id)
+
+    stats = repo.get_transaction_statistics(account.id)
+    assert stats["total_transactions"] == 9
+    assert stats["highest_outcome"] == 400.0
+    assert stats == pytest.approx(_fresh_stats(repo, account.id))
+
+
+def test_edited_amount_is_reflected_in_statistics(session, account):
+    repo = TransactionRepository(session)
+    repo.insert_transaction(_statement(0, 10), account)
+    repo.get_transaction_statistics(account.id)
+
+    repo.update(session.query(BankTransaction).filter_by(description="trx 1").one(), {"outgoing": 5000.0})
+
+    stats = repo.get_transaction_statistics(account.id)
+    assert stats["highest_outcome"] == 5000.0
+    assert stats == pytest.approx(_fresh_stats(repo, account.id))
+
+
+def test_statistics_built_before_an_import_committed_are_rebuilt(session, account):
+    repo = TransactionRepository(session)
+    repo.insert_transaction(_statement(0, 10), account)
+    repo.get_transaction_statistics(account.id)
+    # As if the row was built from a snapshot missing an import that skipped its fold
+    stored = session.get(TransactionStats, account.id)
+    stored.total_transactions -= 2
+    stored.total_income -= 2000.0
+    session.commit()
+
+    stats = repo.get_transaction_statistics(account.id)
+    assert stats["total_transactions"] == 10
+    assert stats == pytest.approx(_fresh_stats(repo, account.id))